@@ -3,8 +3,8 @@
 Demonstrate the differences between old and new Core DNA assistant functionality
 """
 
-from production_server import assemble_grounded_response
-import json
+from response_assembler import assemble_grounded_response
+import orjson
 
 def show_old_vs_new_responses():
     """Show side-by-side comparison of old vs new response formats"""
@@ -103,7 +103,7 @@ def show_json_output_example():
     
     response = assemble_grounded_response("What e-commerce features does Core DNA have?", context, 0.9)
     
-    print(json.dumps(response, indent=2))
+    print(orjson.dumps(response, option=orjson.OPT_INDENT_2).decode())
 
 if __name__ == "__main__":
     show_old_vs_new_responses()
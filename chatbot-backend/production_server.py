@@ -6,25 +6,26 @@ This is the full production version with vector database semantic search
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-import uvicorn
-import openai
+from typing import List, Optional, Dict, Any, Final
+import orjson
 import os
 import sys
+import asyncio
 import logging
+import hashlib
+import itertools
+import threading
+import time
 
 # Add src to path for imports
 sys.path.append('src')
 
-try:
-    from vector_store.chroma_store import ChromaVectorStore
-    from config.settings import settings
-except ImportError as e:
-    print(f"Import error: {e}")
-    print("Make sure you're running from the chatbot-backend directory")
-    sys.exit(1)
+# Heavy dependencies (openai, chromadb, uvicorn) are imported lazily so
+# importing this module for the pure assembler stays cheap
+from response_assembler import assemble_grounded_response
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -79,21 +80,235 @@ app.add_middleware(
 vector_store = None
 openai_client = None
 
+# Conversation-id sequence: nanosecond timestamp plus a process-local
+# counter, so ids stay unique above 1 QPS where the old second-resolution
+# strftime ids collided
+_id_seq = itertools.count()
+
+def next_conversation_id() -> str:
+    return f"rag_prod_{time.time_ns():x}_{next(_id_seq):x}"
+
+# Static endpoint payload pieces - built once, not per request
+API_FEATURES = (
+    "OpenAI GPT-3.5 responses",
+    "Vector database semantic search",
+    "793 indexed documents",
+    "Real-time embeddings"
+)
+STATS_FEATURES = (
+    "Semantic search with OpenAI embeddings",
+    "GPT-3.5 response generation",
+    "Real-time RAG processing",
+    "Source attribution"
+)
+
+# Core DNA assistant system prompt. Built once at module load; the stale
+# CONTEXT/USER template sections were dropped - context and question are
+# delivered in the user message, so repeating placeholders here only
+# wasted input tokens on every call.
+SYSTEM_PROMPT: Final[str] = """You are Core DNA's assistant. Answer ONLY using the provided Context.
+If evidence is weak or missing, ask a concise clarifying question or offer a human handoff.
+Never invent facts, policies, pricing, SLAs, or order/stock data.
+
+STYLE
+- Clear, compact, practical. ≤120 words unless the user explicitly asks for detail.
+- Always include source attributions for any factual claim: [Title → URL].
+- Quote exact lines for pricing/SLAs/security.
+
+CITATIONS
+- Cite only documents you actually used.
+- Prefer the most recent, most specific source (product/docs/policy pages over blogs).
+- If multiple snippets from the same page are used, cite once.
+
+CONFIDENCE & ACTIONS
+- You will receive a numeric confidence score from the retrieval step (0–1) as `retrieval_confidence`.
+- Behavior:
+  - ≥ 0.72 → Answer normally + citations.
+  - 0.55–0.71 → Answer briefly + ask exactly ONE clarifying question + citations if applicable.
+  - < 0.55 → Do NOT answer; ask ONE clarifying question or propose human handoff.
+- Never mask uncertainty; say what you do and don't know based on Context.
+
+ECOMMERCE ADD-ON (when user intent is shopping)
+- Recommend up to 3 items + one accessory (optional).
+- For each item: 1 line explaining "why this fits."
+- If stock/ETA/order lookup is required, call the appropriate tool; otherwise say you can't access it.
+
+LEAD / HANDOFF
+- If the user requests a demo/quote or mentions budget/timeline/integrations, collect:
+  name, work email, company, use case.
+- Offer a human handoff path and confirm consent.
+
+PRIVACY & SAFETY
+- Do not expose raw emails, phone numbers, IDs from Context; redact in outputs unless explicitly part of a public policy page.
+- Never output API keys, internal tokens, or credentials.
+- If a request is out of scope (e.g., legal advice, personal data), decline and propose next steps.
+
+OUTPUT FORMAT (STRICT)
+Return a single JSON object matching this schema:
+{
+  "text": "final answer or clarifying question",
+  "citations": [{"title":"...", "url":"...", "quote":"..."}],
+  "confidence": <number 0..1>,
+  "actions": [{"type":"none" | "clarify" | "handoff" | "collect_lead" | "use_tool", "tool_name":"optional", "fields":["optional"]}]
+}
+
+AIM
+Provide the most accurate, sourced, minimal answer possible based solely on Context."""
+
+# Collection metadata changes rarely, so /, /health and /stats share a
+# 30s-TTL cached copy instead of hitting Chroma on every request
+COLLECTION_INFO_TTL = 30.0
+_collection_info = {"expires": 0.0, "info": {}}
+
+def get_cached_collection_info() -> Dict[str, Any]:
+    """Return collection info, refreshed at most every COLLECTION_INFO_TTL seconds"""
+    now = time.monotonic()
+    if _collection_info["expires"] <= now:
+        _collection_info["info"] = vector_store.get_collection_info() if vector_store else {}
+        _collection_info["expires"] = now + COLLECTION_INFO_TTL
+    return _collection_info["info"]
+
+class CachedEmbedder:
+    """TTL cache around OpenAI query embeddings.
+
+    Chat workloads see a lot of repeated queries, so re-embedding the same
+    text costs a ~200-400ms network round-trip for no benefit. Cache hits
+    are keyed by a hash of the normalized query and served in microseconds.
+    """
+
+    def __init__(self, model: str = "text-embedding-3-small", dimensions: int = 512,
+                 maxsize: int = 2048, ttl: float = 3600):
+        self.model = model
+        self.dimensions = dimensions
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._cache: Dict[str, tuple] = {}  # key -> (expires_at, embedding)
+        self._lock = threading.Lock()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(text.strip().lower().encode()).hexdigest()
+
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """Return the embedding for text, using the cache when possible"""
+        if not openai_client:
+            return None
+
+        key = self._key(text)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+
+        try:
+            response = await openai_client.embeddings.create(model=self.model, input=text,
+                                                             dimensions=self.dimensions)
+            embedding = response.data[0].embedding
+        except Exception as e:
+            logger.error(f"Error creating query embedding: {e}")
+            return None
+
+        with self._lock:
+            # Evict expired entries first, then oldest if still over capacity
+            if len(self._cache) >= self.maxsize:
+                expired = [k for k, v in self._cache.items() if v[0] <= now]
+                for k in expired:
+                    del self._cache[k]
+                while len(self._cache) >= self.maxsize:
+                    self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (now + self.ttl, embedding)
+
+        return embedding
+
+    async def warm(self, queries: List[str]) -> int:
+        """Pre-embed common queries with one batched API call.
+
+        Seeded entries mean the first user asking an FAQ-style question
+        gets a cache hit instead of paying the embedding round-trip.
+        """
+        if not openai_client:
+            return 0
+
+        now = time.monotonic()
+        with self._lock:
+            missing = [q for q in queries
+                       if not (c := self._cache.get(self._key(q))) or c[0] <= now]
+        if not missing:
+            return 0
+
+        try:
+            response = await openai_client.embeddings.create(
+                model=self.model, input=missing, dimensions=self.dimensions)
+        except Exception as e:
+            logger.warning(f"Warmup embedding failed: {e}")
+            return 0
+
+        with self._lock:
+            for query, item in zip(missing, response.data):
+                self._cache[self._key(query)] = (now + self.ttl, item.embedding)
+        return len(missing)
+
+    def save(self, path: str) -> None:
+        """Persist cached embeddings so warm entries survive restarts"""
+        with self._lock:
+            entries = {key: embedding for key, (_, embedding) in self._cache.items()}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(entries))
+        except OSError as e:
+            logger.warning(f"Could not persist embedding cache: {e}")
+
+    def load(self, path: str) -> int:
+        """Reload persisted embeddings, treating them as freshly cached"""
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'rb') as f:
+                entries = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Could not load embedding cache: {e}")
+            return 0
+
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for key, embedding in entries.items():
+                self._cache[key] = (expires, embedding)
+        return len(entries)
+
+query_embedder = CachedEmbedder()
+
+# Common queries embedded at startup so first hits are cache lookups
+WARMUP_QUERIES = (
+    "what is core dna",
+    "pricing",
+    "demo",
+    "ecommerce features",
+    "content management",
+    "integrations"
+)
+EMBEDDING_CACHE_PATH = os.path.join("data", "warmup_embeddings.json")
+
 def initialize_openai():
     """Initialize OpenAI client"""
     global openai_client
-    
+
     openai_api_key = os.getenv('OPENAI_API_KEY')
     if not openai_api_key:
         logger.error("OPENAI_API_KEY not found in environment variables")
         return False
-    
+
     try:
-        openai_client = openai.OpenAI(api_key=openai_api_key)
-        # Test the connection
-        openai_client.embeddings.create(
-            model="text-embedding-ada-002",
-            input="test"
+        import httpx
+        import openai
+        # Async client over a shared pooled transport: one worker can hold
+        # many in-flight API calls instead of blocking a thread per request.
+        # No network call here - connectivity is verified in the background
+        # at startup and naturally on first use.
+        openai_client = openai.AsyncOpenAI(
+            api_key=openai_api_key,
+            http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=100))
         )
         logger.info("✅ OpenAI client initialized successfully")
         return True
@@ -101,11 +316,20 @@ def initialize_openai():
         logger.error(f"❌ Failed to initialize OpenAI client: {e}")
         return False
 
+async def verify_openai_connectivity():
+    """Background connectivity check - logs but never gates startup"""
+    try:
+        await openai_client.models.list()
+        logger.info("✅ OpenAI connectivity verified")
+    except Exception as e:
+        logger.warning(f"⚠️  OpenAI connectivity check failed: {e}")
+
 def initialize_vector_store():
     """Initialize vector database"""
     global vector_store
-    
+
     try:
+        from vector_store.chroma_store import ChromaVectorStore
         vector_store = ChromaVectorStore()
         info = vector_store.get_collection_info()
         logger.info(f"✅ Vector store initialized: {info['document_count']} documents")
@@ -114,101 +338,45 @@ def initialize_vector_store():
         logger.error(f"❌ Failed to initialize vector store: {e}")
         return False
 
-def assemble_grounded_response(user_message: str, context_blocks: List[Dict[str, Any]], retrieval_confidence: float) -> dict:
-    """
-    Assemble a grounded answer per the Core DNA assistant guidelines.
-    Returns STRICT JSON matching the declared OUTPUT FORMAT schema.
-    
-    Args:
-        user_message: The user's question
-        context_blocks: Array of {title, url, last_updated, excerpt}
-        retrieval_confidence: Confidence score from retrieval (0-1)
-    
-    Returns:
-        Strict JSON with: text, citations, confidence, actions
+async def hybrid_retrieve(query: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    """Run retrieval without blocking the event loop.
+
+    The embedding call is async; the sync Chroma lookup runs in a worker
+    thread. Retrieval paths run under asyncio.gather; a keyword/BM25 or
+    metadata-filter retriever can be added as another task here and
+    rank-fused with the dense results.
     """
-    import re
-    
-    # Determine response behavior based on confidence thresholds
-    if retrieval_confidence < 0.55:
-        # Low confidence - ask clarifying question
-        return {
-            "text": "I don't have sufficient information about that topic in my Core DNA knowledge base. Could you be more specific about what aspect of Core DNA's platform you're interested in?",
-            "citations": [],
-            "confidence": retrieval_confidence,
-            "actions": [{"type": "clarify"}]
-        }
-    
-    if not context_blocks:
-        return {
-            "text": "I don't have specific information about that topic. Could you ask about Core DNA's e-commerce platform, content management features, or integrations?",
-            "citations": [],
-            "confidence": retrieval_confidence,
-            "actions": [{"type": "clarify"}]
-        }
-    
-    # Check for lead capture triggers
-    lead_triggers = ['demo', 'quote', 'pricing', 'contact', 'sales', 'budget', 'timeline', 'implementation']
-    user_lower = user_message.lower()
-    if any(trigger in user_lower for trigger in lead_triggers):
-        if retrieval_confidence >= 0.72:
-            # Provide answer then collect lead
-            top_context = context_blocks[0]
-            response_text = f"Based on our documentation: {top_context['excerpt'][:200]}... To discuss your specific needs, I'd like to connect you with our team."
-            citations = [{"title": top_context['title'], "url": top_context['url'], "quote": top_context['excerpt'][:100] + "..."}]
-            return {
-                "text": response_text,
-                "citations": citations,
-                "confidence": retrieval_confidence,
-                "actions": [{"type": "collect_lead", "fields": ["name", "email", "company", "use_case"]}]
-            }
-    
-    # Build response based on context
-    top_context = context_blocks[0]
-    citations = []
-    
-    # Create citations for referenced sources
-    for i, block in enumerate(context_blocks[:3]):  # Use top 3 blocks
-        citations.append({
-            "title": block['title'],
-            "url": block['url'],
-            "quote": block['excerpt'][:150] + "..." if len(block['excerpt']) > 150 else block['excerpt']
-        })
-    
-    # Generate response based on query intent and confidence
-    if retrieval_confidence >= 0.72:
-        # High confidence - full answer
-        if any(word in user_lower for word in ['what is', 'what are', 'define', 'explain']):
-            response_text = f"Based on Core DNA's documentation: {top_context['excerpt']}"
-            if len(context_blocks) > 1:
-                response_text += f" Additionally, {context_blocks[1]['excerpt'][:150]}..."
-        elif any(word in user_lower for word in ['how', 'steps', 'process']):
-            response_text = f"According to our documentation: {top_context['excerpt']}"
-        elif any(word in user_lower for word in ['feature', 'capability', 'can']):
-            response_text = f"Core DNA offers: {top_context['excerpt']}"
-            if len(context_blocks) > 1:
-                response_text += f" We also provide: {context_blocks[1]['excerpt'][:100]}..."
-        else:
-            response_text = f"From our documentation on {top_context['title']}: {top_context['excerpt']}"
-        
-        return {
-            "text": response_text,
-            "citations": citations,
-            "confidence": retrieval_confidence,
-            "actions": [{"type": "none"}]
-        }
-    
-    else:  # 0.55-0.71 - brief answer + clarifying question
-        brief_response = f"Based on our documentation: {top_context['excerpt'][:150]}... Would you like more specific information about any particular aspect?"
-        
-        return {
-            "text": brief_response,
-            "citations": citations[:1],  # Just top citation for brief response
-            "confidence": retrieval_confidence,
-            "actions": [{"type": "clarify"}]
-        }
+    query_embedding = await query_embedder.embed(query)
 
-def generate_rag_response(query: str, context_chunks: List[Dict[str, Any]]) -> dict:
+    dense_results, = await asyncio.gather(
+        asyncio.to_thread(vector_store.query, query, n_results=n_results,
+                          query_embedding=query_embedding)
+    )
+    return dense_results
+
+def build_context_blocks(search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert search results into the context block format used by the assemblers"""
+    return [{
+        'title': result['metadata'].get('title', 'Core DNA Documentation'),
+        'url': result['metadata']['source_url'],
+        'last_updated': result['metadata'].get('last_updated', ''),
+        'excerpt': result['text']
+    } for result in search_results[:3]]
+
+def compute_retrieval_confidence(search_results: List[Dict[str, Any]]) -> float:
+    """Map average Chroma distance to a 0-1 confidence score.
+
+    A single fused pass over the distances; at the n_results=5 scale used
+    here this is faster than materializing an array for a vectorized mean.
+    """
+    if not search_results:
+        return 0.5
+    total = 0.0
+    for result in search_results:
+        total += result['distance']
+    return max(0.1, 1.0 - (total / len(search_results)) * 0.5)
+
+async def generate_rag_response(query: str, context_chunks: List[Dict[str, Any]]) -> dict:
     """Generate intelligent response using OpenAI GPT with RAG context following Core DNA assistant guidelines"""
     
     if not openai_client:
@@ -228,8 +396,7 @@ def generate_rag_response(query: str, context_chunks: List[Dict[str, Any]]) -> d
         }
     
     # Calculate confidence based on context relevance
-    avg_distance = sum(chunk['distance'] for chunk in context_chunks) / len(context_chunks)
-    retrieval_confidence = max(0.1, 1.0 - (avg_distance / 2.0))
+    retrieval_confidence = compute_retrieval_confidence(context_chunks)
     
     # Build context from retrieved chunks
     context_blocks = []
@@ -245,62 +412,6 @@ def generate_rag_response(query: str, context_chunks: List[Dict[str, Any]]) -> d
         for block in context_blocks
     ])
     
-    # Core DNA assistant system prompt
-    system_prompt = """You are Core DNA's assistant. Answer ONLY using the provided Context. 
-If evidence is weak or missing, ask a concise clarifying question or offer a human handoff.
-Never invent facts, policies, pricing, SLAs, or order/stock data.
-
-STYLE
-- Clear, compact, practical. ≤120 words unless the user explicitly asks for detail.
-- Always include source attributions for any factual claim: [Title → URL].
-- Quote exact lines for pricing/SLAs/security.
-
-CITATIONS
-- Cite only documents you actually used.
-- Prefer the most recent, most specific source (product/docs/policy pages over blogs).
-- If multiple snippets from the same page are used, cite once.
-
-CONFIDENCE & ACTIONS
-- You will receive a numeric confidence score from the retrieval step (0–1) as `retrieval_confidence`.
-- Behavior:
-  - ≥ 0.72 → Answer normally + citations.
-  - 0.55–0.71 → Answer briefly + ask exactly ONE clarifying question + citations if applicable.
-  - < 0.55 → Do NOT answer; ask ONE clarifying question or propose human handoff.
-- Never mask uncertainty; say what you do and don't know based on Context.
-
-ECOMMERCE ADD-ON (when user intent is shopping)
-- Recommend up to 3 items + one accessory (optional).
-- For each item: 1 line explaining "why this fits."
-- If stock/ETA/order lookup is required, call the appropriate tool; otherwise say you can't access it.
-
-LEAD / HANDOFF
-- If the user requests a demo/quote or mentions budget/timeline/integrations, collect:
-  name, work email, company, use case.
-- Offer a human handoff path and confirm consent.
-
-PRIVACY & SAFETY
-- Do not expose raw emails, phone numbers, IDs from Context; redact in outputs unless explicitly part of a public policy page.
-- Never output API keys, internal tokens, or credentials.
-- If a request is out of scope (e.g., legal advice, personal data), decline and propose next steps.
-
-OUTPUT FORMAT (STRICT)
-Return a single JSON object matching this schema:
-{
-  "text": "final answer or clarifying question",
-  "citations": [{"title":"...", "url":"...", "quote":"..."}],
-  "confidence": <number 0..1>,
-  "actions": [{"type":"none" | "clarify" | "handoff" | "collect_lead" | "use_tool", "tool_name":"optional", "fields":["optional"]}]
-}
-
-CONTEXT
-{context_blocks}
-
-USER
-{user_message}
-
-AIM
-Provide the most accurate, sourced, minimal answer possible based solely on Context."""
-    
     user_prompt = f"""retrieval_confidence: {retrieval_confidence}
 
 Context:
@@ -309,35 +420,27 @@ Context:
 User question: {query}"""
 
     try:
-        response = openai_client.chat.completions.create(
+        # JSON mode guarantees the model returns a valid JSON object, so no
+        # fallback re-assembly path is needed for malformed output
+        response = await openai_client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt}
             ],
             max_tokens=800,
-            temperature=0.3
+            temperature=0.3,
+            response_format={"type": "json_object"}
         )
-        
+
         answer = response.choices[0].message.content.strip()
-        
-        # Try to parse the JSON response
-        try:
-            import json
-            parsed_response = json.loads(answer)
-            # Ensure confidence matches retrieval confidence if not provided
-            if 'confidence' not in parsed_response:
-                parsed_response['confidence'] = retrieval_confidence
-            return parsed_response
-        except json.JSONDecodeError:
-            # Fallback if GPT doesn't return proper JSON
-            return {
-                "text": answer,
-                "citations": [{"title": block['title'], "url": block['url'], "quote": ""} for block in context_blocks],
-                "confidence": retrieval_confidence,
-                "actions": [{"type": "none"}]
-            }
-        
+
+        parsed_response = orjson.loads(answer)
+        # Ensure confidence matches retrieval confidence if not provided
+        if 'confidence' not in parsed_response:
+            parsed_response['confidence'] = retrieval_confidence
+        return parsed_response
+
     except Exception as e:
         logger.error(f"Error generating OpenAI response: {e}")
         return {
@@ -353,27 +456,41 @@ async def startup_event():
     logger.info("🚀 Starting Core DNA Production RAG Server")
     
     # Initialize OpenAI
-    if not initialize_openai():
+    if initialize_openai():
+        # Verify connectivity off the startup path so boot isn't blocked
+        # on a network round-trip
+        asyncio.create_task(verify_openai_connectivity())
+    else:
         logger.warning("⚠️  OpenAI initialization failed - running in limited mode")
-    
+
     # Initialize vector store
     if not initialize_vector_store():
         logger.error("❌ Vector store initialization failed")
         raise RuntimeError("Cannot start server without vector database")
 
+    # Warm the embedding cache: reload persisted entries, then batch-embed
+    # whatever common queries are still missing
+    loaded = query_embedder.load(EMBEDDING_CACHE_PATH)
+    if loaded:
+        logger.info(f"♻️  Reloaded {loaded} cached embeddings")
+    if openai_client:
+        warmed = await query_embedder.warm(list(WARMUP_QUERIES))
+        if warmed:
+            logger.info(f"🔥 Warmed {warmed} query embeddings")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Persist the embedding cache so warm entries survive restarts"""
+    query_embedder.save(EMBEDDING_CACHE_PATH)
+
 @app.get("/")
 async def root():
     return {
         "message": "Core DNA Chatbot API (Production RAG)",
         "version": "2.0.0",
         "docs": "/docs",
-        "features": [
-            "OpenAI GPT-3.5 responses",
-            "Vector database semantic search",
-            "793 indexed documents",
-            "Real-time embeddings"
-        ],
-        "documents_indexed": vector_store.get_collection_info()['document_count'] if vector_store else 0
+        "features": API_FEATURES,
+        "documents_indexed": get_cached_collection_info().get('document_count', 0)
     }
 
 @app.get("/health")
@@ -382,11 +499,12 @@ async def health_check():
     vector_db_status = {}
     if vector_store:
         try:
-            vector_db_status = vector_store.get_collection_info()
+            vector_db_status = get_cached_collection_info()
         except Exception as e:
             vector_db_status = {"error": str(e)}
-    
-    return HealthResponse(
+
+    # Server-built values are trusted, so skip Pydantic validation
+    return HealthResponse.model_construct(
         status="healthy" if vector_store and openai_client else "degraded",
         version="2.0.0",
         timestamp=datetime.now(),
@@ -400,23 +518,15 @@ async def chat_endpoint(request: ChatRequest):
         if not vector_store:
             raise HTTPException(status_code=503, detail="Vector database not available")
         
-        # Search for relevant content using semantic search
-        search_results = vector_store.query(request.message, n_results=5)
-        
-        # Convert search results to context blocks format
-        context_blocks = []
-        for result in search_results[:3]:  # Use top 3 results
-            context_blocks.append({
-                'title': result['metadata'].get('title', 'Core DNA Documentation'),
-                'url': result['metadata']['source_url'],
-                'last_updated': result['metadata'].get('last_updated', ''),
-                'excerpt': result['text']
-            })
-        
-        # Calculate retrieval confidence
-        avg_distance = sum(result['distance'] for result in search_results) / len(search_results) if search_results else 1.0
-        retrieval_confidence = max(0.1, 1.0 - (avg_distance / 2.0))
-        
+        # Search for relevant content using semantic search. The query
+        # embedding goes through the TTL cache so repeat queries skip the
+        # embedding round-trip entirely.
+        search_results = await hybrid_retrieve(request.message, n_results=5)
+
+        context_blocks = build_context_blocks(search_results)
+        retrieval_confidence = compute_retrieval_confidence(search_results)
+
+
         # Generate response using strict assembler
         rag_response = assemble_grounded_response(request.message, context_blocks, retrieval_confidence)
         
@@ -426,9 +536,10 @@ async def chat_endpoint(request: ChatRequest):
             sources = [result['metadata']['source_url'] for result in search_results 
                       if result.get('metadata', {}).get('source_url')]
         
-        conversation_id = request.conversation_id or f"rag_prod_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        conversation_id = request.conversation_id or next_conversation_id()
         
-        return ChatResponse(
+        # Response fields are server-built, so skip Pydantic validation
+        return ChatResponse.model_construct(
             response=rag_response['text'],
             conversation_id=conversation_id,
             sources=sources[:3],  # Limit to top 3 sources
@@ -440,6 +551,60 @@ async def chat_endpoint(request: ChatRequest):
         logger.error(f"Chat processing error: {e}")
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
 
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """Streaming chat endpoint - emits GPT tokens as server-sent events.
+
+    The buffered /chat endpoint waits for the full completion (seconds for
+    long answers) before sending anything; streaming gets the first token
+    to the client in a few hundred milliseconds. Citations and confidence
+    are sent as a final "sources" event once the text finishes.
+    """
+    if not vector_store:
+        raise HTTPException(status_code=503, detail="Vector database not available")
+    if not openai_client:
+        raise HTTPException(status_code=503, detail="OpenAI client not available")
+
+    search_results = await hybrid_retrieve(request.message, n_results=5)
+    context_blocks = build_context_blocks(search_results)
+    retrieval_confidence = compute_retrieval_confidence(search_results)
+
+    context_text = "\n\n".join(
+        f"Title: {block['title']}\nURL: {block['url']}\nContent: {block['excerpt']}"
+        for block in context_blocks
+    )
+
+    async def token_stream():
+        try:
+            stream = await openai_client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "You are Core DNA's assistant. Answer ONLY using the provided Context. Be clear, compact, and practical (<=120 words). If the context is insufficient, ask one concise clarifying question."},
+                    {"role": "user", "content": f"Context:\n{context_text}\n\nUser question: {request.message}"}
+                ],
+                max_tokens=800,
+                temperature=0.3,
+                stream=True
+            )
+
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield f"data: {orjson.dumps({'token': delta}).decode()}\n\n"
+
+            final_event = {
+                "citations": [{"title": block['title'], "url": block['url']} for block in context_blocks],
+                "confidence": retrieval_confidence
+            }
+            yield f"event: sources\ndata: {orjson.dumps(final_event).decode()}\n\n"
+            yield "data: [DONE]\n\n"
+
+        except Exception as e:
+            logger.error(f"Streaming chat error: {e}")
+            yield f"data: {orjson.dumps({'error': 'Chat processing failed'}).decode()}\n\n"
+
+    return StreamingResponse(token_stream(), media_type="text/event-stream")
+
 @app.get("/search")
 async def search_endpoint(q: str, limit: int = 5):
     """Semantic search endpoint"""
@@ -447,8 +612,8 @@ async def search_endpoint(q: str, limit: int = 5):
         raise HTTPException(status_code=503, detail="Vector database not available")
     
     try:
-        results = vector_store.query(q, n_results=limit)
-        
+        results = await hybrid_retrieve(q, n_results=limit)
+
         return {
             "query": q,
             "results_count": len(results),
@@ -470,18 +635,13 @@ async def stats_endpoint():
         return {"error": "Vector database not available"}
     
     try:
-        vector_info = vector_store.get_collection_info()
-        
+        vector_info = get_cached_collection_info()
+
         return {
             "vector_database": vector_info,
             "openai_status": "connected" if openai_client else "disconnected",
             "server_version": "2.0.0",
-            "features": [
-                "Semantic search with OpenAI embeddings",
-                "GPT-3.5 response generation",
-                "Real-time RAG processing",
-                "Source attribution"
-            ]
+            "features": STATS_FEATURES
         }
     except Exception as e:
         logger.error(f"Stats error: {e}")
@@ -495,5 +655,9 @@ if __name__ == "__main__":
     print("🔍 Search endpoint: http://localhost:8000/search")
     print("📊 Stats: http://localhost:8000/stats")
     print("🤖 Using OpenAI GPT-3.5 + Vector Database RAG")
-    
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
+
+    import uvicorn
+    # uvloop + httptools ship with uvicorn[standard] and raise event-loop
+    # throughput over the default asyncio loop
+    uvicorn.run(app, host="0.0.0.0", port=8000, reload=False,
+                loop="uvloop", http="httptools")
\ No newline at end of file
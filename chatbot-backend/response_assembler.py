@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Pure-Python response assembly for the Core DNA assistant.
+
+Kept free of framework imports so tools like demo_differences.py can use
+the assembler without paying the FastAPI/OpenAI/Chroma import cost.
+"""
+
+import re
+from typing import List, Dict, Any
+
+# Intent matching is on the per-request hot path, so the trigger and
+# intent patterns are built once at module load instead of per call.
+# Plain alternations, no word boundaries: substring matching keeps the
+# behaviour of the original `in` checks ("salesforce" trips the 'sales'
+# lead trigger, "explains" reads as a definition question).
+def _substring_re(*words: str) -> 're.Pattern':
+    return re.compile('|'.join(map(re.escape, words)))
+
+LEAD_RE = _substring_re('demo', 'quote', 'pricing', 'contact', 'sales',
+                        'budget', 'timeline', 'implementation')
+DEFINE_RE = _substring_re('what is', 'what are', 'define', 'explain')
+HOW_RE = _substring_re('how', 'steps', 'process')
+FEATURE_RE = _substring_re('feature', 'capability', 'can')
+
+def _quote(excerpt: str) -> str:
+    """Citation quote: first 150 chars with an ellipsis when truncated"""
+    return excerpt[:150] + "..." if len(excerpt) > 150 else excerpt
+
+def assemble_grounded_response(user_message: str, context_blocks: List[Dict[str, Any]], retrieval_confidence: float) -> dict:
+    """
+    Assemble a grounded answer per the Core DNA assistant guidelines.
+    Returns STRICT JSON matching the declared OUTPUT FORMAT schema.
+
+    Args:
+        user_message: The user's question
+        context_blocks: Array of {title, url, last_updated, excerpt}
+        retrieval_confidence: Confidence score from retrieval (0-1)
+
+    Returns:
+        Strict JSON with: text, citations, confidence, actions
+    """
+    # Determine response behavior based on confidence thresholds
+    if retrieval_confidence < 0.55:
+        # Low confidence - ask clarifying question
+        return {
+            "text": "I don't have sufficient information about that topic in my Core DNA knowledge base. Could you be more specific about what aspect of Core DNA's platform you're interested in?",
+            "citations": [],
+            "confidence": retrieval_confidence,
+            "actions": [{"type": "clarify"}]
+        }
+
+    if not context_blocks:
+        return {
+            "text": "I don't have specific information about that topic. Could you ask about Core DNA's e-commerce platform, content management features, or integrations?",
+            "citations": [],
+            "confidence": retrieval_confidence,
+            "actions": [{"type": "clarify"}]
+        }
+
+    # Pre-slice each excerpt once; every branch below reuses these fields
+    # instead of re-copying substrings of the same excerpt
+    prepped = [{
+        'title': block['title'],
+        'url': block['url'],
+        'x100': block['excerpt'][:100],
+        'x150': block['excerpt'][:150],
+        'x200': block['excerpt'][:200],
+        'full': block['excerpt']
+    } for block in context_blocks[:3]]
+    top_context = prepped[0]
+
+    # Check for lead capture triggers: one compiled scan over the
+    # message instead of a substring search per trigger
+    user_lower = user_message.lower()
+    if LEAD_RE.search(user_lower) and retrieval_confidence >= 0.72:
+        # Provide answer then collect lead
+        response_text = f"Based on our documentation: {top_context['x200']}... To discuss your specific needs, I'd like to connect you with our team."
+        citations = [{"title": top_context['title'], "url": top_context['url'], "quote": top_context['x100'] + "..."}]
+        return {
+            "text": response_text,
+            "citations": citations,
+            "confidence": retrieval_confidence,
+            "actions": [{"type": "collect_lead", "fields": ["name", "email", "company", "use_case"]}]
+        }
+
+    # Create citations for referenced sources
+    citations = [{
+        "title": block['title'],
+        "url": block['url'],
+        "quote": _quote(block['full'])
+    } for block in prepped]
+
+    # Generate response based on query intent and confidence
+    if retrieval_confidence >= 0.72:
+        # High confidence - full answer
+        if DEFINE_RE.search(user_lower):
+            parts = [f"Based on Core DNA's documentation: {top_context['full']}"]
+            if len(prepped) > 1:
+                parts.append(f" Additionally, {prepped[1]['x150']}...")
+            response_text = "".join(parts)
+        elif HOW_RE.search(user_lower):
+            response_text = f"According to our documentation: {top_context['full']}"
+        elif FEATURE_RE.search(user_lower):
+            parts = [f"Core DNA offers: {top_context['full']}"]
+            if len(prepped) > 1:
+                parts.append(f" We also provide: {prepped[1]['x100']}...")
+            response_text = "".join(parts)
+        else:
+            response_text = f"From our documentation on {top_context['title']}: {top_context['full']}"
+
+        return {
+            "text": response_text,
+            "citations": citations,
+            "confidence": retrieval_confidence,
+            "actions": [{"type": "none"}]
+        }
+
+    else:  # 0.55-0.71 - brief answer + clarifying question
+        brief_response = f"Based on our documentation: {top_context['x150']}... Would you like more specific information about any particular aspect?"
+
+        return {
+            "text": brief_response,
+            "citations": citations[:1],  # Just top citation for brief response
+            "confidence": retrieval_confidence,
+            "actions": [{"type": "clarify"}]
+        }
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+One-shot re-index of existing chunks with the configured embedding model.
+
+Use this after changing EMBEDDING_MODEL/EMBEDDING_DIMENSIONS (e.g. the
+ada-002 -> text-embedding-3-small @ 512 dims switch) so stored vectors
+match what the query path produces.
+"""
+
+import sys
+import os
+import orjson
+import logging
+from datetime import datetime
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.settings import settings
+from vector_store.chroma_store import ChromaVectorStore
+
+sys.path.append(os.path.dirname(__file__))
+from scrape_and_index import embed_batch
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(f'reindex_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
+        logging.StreamHandler()
+    ]
+)
+
+logger = logging.getLogger(__name__)
+
+def main():
+    """Re-embed saved chunks and repopulate the vector database"""
+    chunks_file = os.path.join("data", "processed", "coredna_chunks.json")
+    if not os.path.exists(chunks_file):
+        logger.error(f"Chunks file not found: {chunks_file}")
+        logger.error("Run the scraping pipeline first: python scripts/scrape_and_index.py")
+        return False
+
+    with open(chunks_file, 'rb') as f:
+        chunks = orjson.loads(f.read())
+
+    logger.info(f"Re-indexing {len(chunks)} chunks with {settings.embedding_model} "
+                f"({settings.embedding_dimensions} dims)")
+
+    embeddings = embed_batch([chunk['text'] for chunk in chunks])
+
+    vector_store = ChromaVectorStore()
+    vector_store.reset_collection()
+    # Tag the collection so we can tell which model produced the vectors
+    vector_store.collection.modify(metadata={
+        "description": "Core DNA website content for RAG",
+        "embedding_model": f"{settings.embedding_model}-{settings.embedding_dimensions}"
+    })
+
+    success = vector_store.add_documents(chunks, embeddings=embeddings)
+    if success:
+        info = vector_store.get_collection_info()
+        logger.info(f"Re-indexing completed. Collection info: {info}")
+    else:
+        logger.error("Re-indexing failed")
+
+    return success
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -12,8 +12,7 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import uvicorn
-from api.main import 
-app
+from api.main import app
 from config.settings import settings
 
 # Setup logging
@@ -37,8 +36,8 @@ def main():
     try:
         # Check if data exists
         data_files = [
-            "data/raw/coredna_scraped_data.json",
-            "data/processed/coredna_processed_data.json", 
+            "data/raw/coredna_scraped_data.json.gz",
+            "data/processed/coredna_processed_data.json.gz",
             "data/processed/coredna_chunks.json"
         ]
         
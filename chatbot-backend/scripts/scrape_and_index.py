@@ -13,6 +13,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from scraper.web_scraper import CoreDNAScraper
 from scraper.content_processor import ContentProcessor
+from config.settings import settings
 
 # Setup logging
 logging.basicConfig(
@@ -26,6 +27,41 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def embed_batch(texts, batch_size=256):
+    """Embed texts with batched OpenAI API calls
+
+    The embeddings endpoint accepts arrays of inputs, so sending one chunk
+    per request wastes a full network round-trip each time. Batching
+    amortizes that overhead across hundreds of chunks per call.
+    """
+    import openai
+
+    client = openai.OpenAI(api_key=settings.openai_api_key)
+    embeddings = []
+
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        response = client.embeddings.create(
+            model=settings.embedding_model,
+            input=batch,
+            dimensions=settings.embedding_dimensions
+        )
+        embeddings.extend(item.embedding for item in response.data)
+        logger.info(f"Embedded {len(embeddings)}/{len(texts)} chunks")
+
+    return embeddings
+
+def index_chunks(chunks, batch_size: int = 250) -> bool:
+    """Batch-embed chunks and load them into the vector database"""
+    from vector_store.chroma_store import ChromaVectorStore
+
+    embeddings = embed_batch([chunk['text'] for chunk in chunks])
+
+    vector_store = ChromaVectorStore()
+    vector_store.reset_collection()
+    return vector_store.add_documents(chunks, embeddings=embeddings,
+                                      chroma_batch_size=batch_size)
+
 def main():
     """Run the complete scraping and processing pipeline"""
     logger.info("=" * 60)
@@ -67,12 +103,25 @@ def main():
         chunks_output = os.path.join("data", "processed", "coredna_chunks.json")
         os.makedirs(os.path.dirname(chunks_output), exist_ok=True)
         
-        import json
-        with open(chunks_output, 'w', encoding='utf-8') as f:
-            json.dump(chunks, f, indent=2, ensure_ascii=False)
-            
+        # orjson serializes at C speed without building an intermediate
+        # Python string, roughly halving peak memory for large chunk lists
+        import orjson
+        with open(chunks_output, 'wb') as f:
+            f.write(orjson.dumps(chunks, option=orjson.OPT_INDENT_2))
+
+
         logger.info(f"Created {len(chunks)} text chunks and saved to {chunks_output}")
-        
+
+        # Step 4: Index chunks into the vector database (batched embeddings)
+        indexed = False
+        if settings.openai_api_key:
+            logger.info("Step 4: Indexing chunks into vector database...")
+            indexed = index_chunks(chunks)
+            if not indexed:
+                logger.error("Indexing failed - chunks are saved, re-run indexing separately")
+        else:
+            logger.info("Step 4 skipped: OPENAI_API_KEY not set - run vector database indexing separately")
+
         # Summary
         logger.info("=" * 60)
         logger.info("PIPELINE COMPLETED SUCCESSFULLY")
@@ -84,7 +133,10 @@ def main():
         logger.info(f"📁 Processed data: {processed_data_path}")
         logger.info(f"📁 Text chunks: {chunks_output}")
         logger.info("=" * 60)
-        logger.info("Next step: Run vector database indexing")
+        if indexed:
+            logger.info("Vector database indexing completed")
+        else:
+            logger.info("Next step: Run vector database indexing")
         
         return True
         
@@ -3,29 +3,50 @@
 Setup and initialize the vector database with Core DNA content
 """
 
+import asyncio
+import orjson
+import queue
 import sys
 import os
+import time
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
+from pathlib import Path
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from vector_store.chroma_store import ChromaVectorStore, index_coredna_documents
+from vector_store.chroma_store import ChromaVectorStore, aindex_coredna_documents, get_store
 from vector_store.embeddings import EmbeddingManager
+from config.settings import settings
+
+# Setup logging: records are enqueued by the main thread and drained to
+# the handlers by a background listener, so logging in the indexing loop
+# never blocks on disk. The log file gets a 64KB buffer to batch writes.
+log_queue = queue.Queue(-1)
+log_file = open(
+    f'database_setup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log',
+    'a', buffering=1 << 16, encoding='utf-8'
+)
+log_listener = QueueListener(
+    log_queue,
+    logging.StreamHandler(log_file),
+    logging.StreamHandler()
+)
 
-# Setup logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f'database_setup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(log_queue)]
 )
 
 logger = logging.getLogger(__name__)
 
+# Resolved once at import; every code path below reuses it instead of
+# re-joining the path
+CHUNKS_FILE = Path(__file__).resolve().parent.parent / "data" / "processed" / "coredna_chunks.json"
+
 def test_embeddings() -> bool:
     """Test if OpenAI embeddings are working"""
     logger.info("Testing OpenAI embeddings...")
@@ -46,15 +67,15 @@ def test_embeddings() -> bool:
         logger.error("💡 Make sure to set your OpenAI API key in the .env file")
         return False
 
-def setup_vector_database() -> bool:
+def setup_vector_database(use_batch_api: bool = False) -> bool:
     """Setup and populate the vector database"""
     logger.info("=" * 60)
     logger.info("Setting up Core DNA vector database")
     logger.info("=" * 60)
     
     # Check if processed chunks exist
-    chunks_file = os.path.join("data", "processed", "coredna_chunks.json")
-    if not os.path.exists(chunks_file):
+    chunks_file = str(CHUNKS_FILE)
+    if not CHUNKS_FILE.exists():
         logger.error(f"Processed chunks file not found: {chunks_file}")
         logger.error("Run the scraping pipeline first: python scripts/scrape_and_index.py")
         return False
@@ -63,28 +84,51 @@ def setup_vector_database() -> bool:
     if not test_embeddings():
         return False
     
-    # Index documents
+    # Index documents with concurrent embedding batches, or via the
+    # Batch API when cost matters more than turnaround
     logger.info("Indexing Core DNA documents into vector database...")
-    success = index_coredna_documents(chunks_file)
-    
+    vector_store = get_store()
+
+    test_queries = [
+        "ecommerce platform features",
+        "content management system",
+        "API integration capabilities"
+    ]
+
+    # The smoke-test queries are independent and network-bound, so
+    # run them concurrently instead of one after another
+    async def run_test_queries():
+        return await asyncio.gather(
+            *[vector_store.aquery(query, n_results=3) for query in test_queries]
+        )
+
+    if use_batch_api:
+        success = index_with_batch_api(chunks_file)
+        test_results = asyncio.run(run_test_queries()) if success else None
+    else:
+        # Indexing and the smoke tests share one event loop: the cached
+        # AsyncOpenAI client binds its connection pool to the loop it
+        # first runs on, and a second asyncio.run would find that loop
+        # closed and every query would fail
+        async def index_then_test():
+            indexed = await aindex_coredna_documents(chunks_file, store=vector_store)
+            return indexed, (await run_test_queries()) if indexed else None
+
+        success, test_results = asyncio.run(index_then_test())
+
     if success:
         # Test query
         logger.info("Testing vector database with sample query...")
-        vector_store = ChromaVectorStore()
-        
-        test_queries = [
-            "ecommerce platform features",
-            "content management system",
-            "API integration capabilities"
-        ]
-        
-        for query in test_queries:
-            results = vector_store.query(query, n_results=3)
-            logger.info(f"Query: '{query}' returned {len(results)} results")
-            
+
+        # Lazy %-style formatting: the message (including the 100-char
+        # text slice via %.100s) is only built if INFO is enabled
+        for query, results in zip(test_queries, test_results):
+            logger.info("Query: '%s' returned %d results", query, len(results))
+
             if results:
                 best_result = results[0]
-                logger.info(f"  Best match (distance: {best_result['distance']:.3f}): {best_result['text'][:100]}...")
+                logger.info("  Best match (distance: %.3f): %.100s...",
+                            best_result['distance'], best_result['text'])
         
         # Get collection info
         info = vector_store.get_collection_info()
@@ -103,12 +147,92 @@ def setup_vector_database() -> bool:
         logger.error("Failed to index documents")
         return False
 
+def index_with_batch_api(chunks_file: str, poll_interval: int = 30) -> bool:
+    """Index documents through the OpenAI Batch API
+
+    The initial bulk index is latency-insensitive, which is what the
+    Batch API is for: half the per-token cost and a separate, higher
+    rate-limit pool. Submits one JSONL of embedding requests, polls
+    until the batch completes, then bulk-inserts the vectors into
+    Chroma.
+    """
+    import openai
+
+    try:
+        with open(chunks_file, 'rb') as f:
+            chunks = orjson.loads(f.read())
+
+        logger.info(f"Loaded {len(chunks)} chunks from {chunks_file}")
+
+        # One request line per chunk; custom_id carries the chunk index
+        # so results can be mapped back regardless of output order
+        requests_path = os.path.join("data", "processed", "embedding_batch_requests.jsonl")
+        with open(requests_path, 'wb') as f:
+            for i, chunk in enumerate(chunks):
+                f.write(orjson.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/embeddings",
+                    "body": {
+                        "model": settings.embedding_model,
+                        "input": chunk['text'],
+                        "dimensions": settings.embedding_dimensions
+                    }
+                }) + b"\n")
+
+        client = openai.OpenAI(api_key=settings.openai_api_key)
+
+        with open(requests_path, 'rb') as f:
+            batch_file = client.files.create(file=f, purpose="batch")
+
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/embeddings",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted batch {batch.id}, polling every {poll_interval}s...")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+            logger.info(f"Batch {batch.id} status: {batch.status}")
+
+        if batch.status != "completed":
+            logger.error(f"Batch {batch.id} ended with status: {batch.status}")
+            return False
+
+        output = client.files.content(batch.output_file_id)
+        embeddings = [None] * len(chunks)
+        for line in output.text.splitlines():
+            result = orjson.loads(line)
+            index = int(result['custom_id'])
+            embeddings[index] = result['response']['body']['data'][0]['embedding']
+
+        missing = sum(1 for vector in embeddings if vector is None)
+        if missing:
+            logger.error(f"Batch output missing {missing} embeddings")
+            return False
+
+        vector_store = get_store()
+        vector_store.reset_collection()
+        success = vector_store.add_documents(chunks, embeddings=embeddings)
+
+        if success:
+            info = vector_store.get_collection_info()
+            logger.info(f"Batch indexing completed. Collection info: {info}")
+
+        return success
+
+    except Exception as e:
+        logger.error(f"Error indexing via Batch API: {e}")
+        return False
+
 def reset_database() -> bool:
     """Reset the vector database"""
     logger.info("Resetting vector database...")
     
     try:
-        vector_store = ChromaVectorStore()
+        vector_store = get_store()
         success = vector_store.reset_collection()
         
         if success:
@@ -129,19 +253,25 @@ def main():
     parser = argparse.ArgumentParser(description="Setup Core DNA vector database")
     parser.add_argument("--reset", action="store_true", help="Reset the database before setup")
     parser.add_argument("--test-only", action="store_true", help="Only test embeddings, don't setup database")
-    
+    parser.add_argument("--batch-api", action="store_true", help="Embed via the OpenAI Batch API (cheaper, up to 24h turnaround)")
+
     args = parser.parse_args()
-    
-    if args.test_only:
-        success = test_embeddings()
+
+    log_listener.start()
+    try:
+        if args.test_only:
+            success = test_embeddings()
+            sys.exit(0 if success else 1)
+
+        if args.reset:
+            if not reset_database():
+                sys.exit(1)
+
+        success = setup_vector_database(use_batch_api=args.batch_api)
         sys.exit(0 if success else 1)
-    
-    if args.reset:
-        if not reset_database():
-            sys.exit(1)
-    
-    success = setup_vector_database()
-    sys.exit(0 if success else 1)
+    finally:
+        # Drain queued records before the process exits
+        log_listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,10 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from contextlib import asynccontextmanager
+import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import Optional
 import uuid
@@ -10,6 +13,7 @@ try:
     from ..config.settings import settings
     from .models.schemas import ChatRequest, ChatResponse, HealthResponse, IndexStatus
     from .routes import chat, health
+    from ..vector_store.chroma_store import get_store
 except ImportError:
     import sys
     import os
@@ -17,18 +21,52 @@ except ImportError:
     from config.settings import settings
     from api.models.schemas import ChatRequest, ChatResponse, HealthResponse, IndexStatus
     from api.routes import chat, health
+    from vector_store.chroma_store import get_store
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared clients at startup, not on the first request"""
+    logger.info("🚀 Starting Core DNA Chatbot API")
+    logger.info(f"📊 Environment: {settings.api_host}:{settings.api_port}")
+    logger.info(f"📁 Database path: {settings.chroma_db_path}")
+    # Warm the process-wide singletons so the persistent Chroma client
+    # and HNSW index are opened once here instead of inside the first
+    # request; routes reach the same objects through get_store() /
+    # get_retriever().
+    app.state.vector_store = get_store()
+    app.state.retriever = chat.get_retriever()
+
+    if settings.warmup_on_start:
+        # A throwaway retrieval faults in the HNSW index and embedding
+        # machinery here instead of inside the first /chat request, and
+        # surfaces a broken collection in the startup log.
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(
+                app.state.retriever.retrieve_relevant_docs, "warmup", 1, 0.0
+            )
+            logger.info(f"🔥 Warmup retrieval took {time.perf_counter() - started:.3f}s")
+        except Exception as e:
+            logger.warning(f"Warmup retrieval failed: {e}")
+
+    yield
+    logger.info("👋 Shutting down Core DNA Chatbot API")
+
 # Create FastAPI app
 app = FastAPI(
     title="Core DNA Chatbot API",
     description="RAG-powered chatbot API for Core DNA platform information",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson serializes responses several times faster than the stdlib
+    # encoder, which matters for the nested structures /chat returns
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware for frontend integration
@@ -65,20 +103,6 @@ async def root():
         "chat": "/chat"
     }
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
-    logger.info("🚀 Starting Core DNA Chatbot API")
-    logger.info(f"📊 Environment: {settings.api_host}:{settings.api_port}")
-    logger.info(f"📁 Database path: {settings.chroma_db_path}")
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("👋 Shutting down Core DNA Chatbot API")
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
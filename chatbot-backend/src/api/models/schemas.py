@@ -1,31 +1,51 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime
 
 class ChatMessage(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     role: str  # "user" or "assistant"
     content: str
     timestamp: Optional[datetime] = None
 
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     message: str
     conversation_id: Optional[str] = None
     max_tokens: Optional[int] = 1000
     temperature: Optional[float] = 0.7
 
 class ChatResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     response: str
     conversation_id: str
     sources: List[str] = []
     confidence_score: Optional[float] = None
 
+class ChatBatchRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    messages: List[ChatRequest]
+
+class ChatBatchResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    responses: List[ChatResponse]
+
 class HealthResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     status: str
     version: str
     database_status: str
     timestamp: datetime
 
 class IndexStatus(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     total_documents: int
     last_updated: Optional[datetime] = None
     is_ready: bool
\ No newline at end of file
@@ -1,99 +1,284 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+import asyncio
+import functools
 import logging
+import re
+import orjson
 import uuid
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 try:
     from ...config.settings import settings
-    from ..models.schemas import ChatRequest, ChatResponse
-    from ...vector_store.chroma_store import ChromaVectorStore
+    from ..models.schemas import (ChatRequest, ChatResponse,
+                                  ChatBatchRequest, ChatBatchResponse)
     from ...rag.retriever import DocumentRetriever
+    from ...utils.time import now_iso
 except ImportError:
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
     from config.settings import settings
-    from api.models.schemas import ChatRequest, ChatResponse
-    from vector_store.chroma_store import ChromaVectorStore
+    from api.models.schemas import (ChatRequest, ChatResponse,
+                                    ChatBatchRequest, ChatBatchResponse)
     from rag.retriever import DocumentRetriever
+    from utils.time import now_iso
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Initialize retriever (without RAG engine for now due to OpenAI quota)
-retriever = DocumentRetriever()
+@functools.lru_cache(maxsize=1)
+def get_retriever() -> DocumentRetriever:
+    """Shared retriever over the process-wide vector store
 
-@router.post("/", response_model=ChatResponse)
-async def chat_endpoint(request: ChatRequest):
-    """Main chat endpoint - processes user questions"""
+    Built lazily on first use (or at app startup via the lifespan
+    hook), not at import, so importing this module stays cheap.
+    """
+    # Without RAG engine for now due to OpenAI quota
+    return DocumentRetriever()
+
+# Response cache: repeat questions skip retrieval and composition
+# entirely. The version token is part of every cache key, so bumping it
+# after a knowledge-base refresh makes all old entries unreachable and
+# they age out of the LRU naturally.
+_cache_version = 0
+
+def invalidate_response_cache() -> None:
+    """Make cached answers stale after a knowledge-base refresh"""
+    global _cache_version
+    _cache_version += 1
+
+def _normalize_message(message: str) -> str:
+    return ' '.join(message.lower().split())
+
+def _substring_re(*words: str) -> 're.Pattern':
+    """One compiled alternation matching any of words as substrings"""
+    return re.compile('|'.join(map(re.escape, words)))
+
+# Question-type keyword sets, compiled once at import and checked in
+# the fallback's priority order. Substring matching (no word
+# boundaries) keeps the behaviour of the original `in` checks.
+_RE_DEFINITION = _substring_re('what is', 'what are', 'define', 'explain')
+_RE_HOWTO = _substring_re('how to', 'how do', 'how can')
+_RE_FEATURES = _substring_re('features', 'capabilities', 'functionality')
+_RE_PRICING = _substring_re('price', 'cost', 'pricing', 'plan')
+# Summaries that look like process documentation, for the how-to branch
+_RE_PROCESS = _substring_re('how', 'step')
+
+_RESPONSE_FOOTER = (
+    "\n\nFor more detailed information, you can check the specific "
+    "Core DNA documentation pages I referenced."
+)
+
+_NO_DOCS_MESSAGE = (
+    "I don't have specific information about that topic in my Core DNA "
+    "knowledge base. Could you try rephrasing your question or ask about "
+    "Core DNA's ecommerce platform, features, or services?"
+)
+_DEGRADED_MESSAGE = (
+    "I'm having trouble accessing my knowledge base right now. Please try "
+    "asking about Core DNA's ecommerce platform, content management, or "
+    "integration capabilities."
+)
+
+def _chat_json_template(message: str) -> bytes:
+    """Pre-encoded ChatResponse body with a %s slot for conversation_id"""
+    body = orjson.dumps({
+        "response": message,
+        "conversation_id": "CID",
+        "sources": [],
+        "confidence_score": 0.1,
+    })
+    return body.replace(b'"CID"', b'"%s"')
+
+# The two constant-body replies differ only in conversation_id, so their
+# JSON is encoded once at import and Pydantic validation plus response
+# encoding are skipped. The byte splice is safe only for ids this server
+# generated itself (UUID strings never need JSON escaping); client-
+# supplied ids go through the typed ChatResponse, which escapes them.
+_NO_DOCS_TEMPLATE = _chat_json_template(_NO_DOCS_MESSAGE)
+_DEGRADED_TEMPLATE = _chat_json_template(_DEGRADED_MESSAGE)
+
+def _answer_question(message: str) -> Tuple[str, List[str], float]:
+    """Run retrieval and compose the response text
+
+    Returns (response_text, sources, confidence_score); raises on
+    retrieval failure (raise_on_error below — the retriever's default
+    of swallowing errors into [] would let lru_cache pin the no-docs
+    answer for a query that merely hit a transient outage).
+    """
+    # One embedding + one Chroma query covers both the answer documents
+    # and the context string
+    relevant_docs, context = get_retriever().retrieve_and_contextualize(
+        query=message,
+        n_results=5,
+        min_relevance_score=0.1,
+        max_context_length=2000,
+        raise_on_error=True
+    )
+
+    if not relevant_docs:
+        return (_NO_DOCS_MESSAGE, [], 0.1)
+
+    # Extract source URLs
+    sources = []
+    for doc in relevant_docs[:3]:  # Top 3 sources
+        metadata = doc.get('metadata', {})
+        source_url = metadata.get('source_url', '')
+
+        if source_url:
+            sources.append(source_url)
+
+    # For now, create a contextual response without OpenAI
+    response_text = create_fallback_response(message, relevant_docs)
+    return response_text, sources, 0.8
+
+@functools.lru_cache(maxsize=1024)
+def _answer_cached(norm_msg: str, version: int) -> Tuple[str, List[str], float]:
+    return _answer_question(norm_msg)
+
+async def _resolve_answer(message: str):
+    """Answer through the cache or directly, off the event loop"""
+    if settings.enable_response_cache:
+        return await asyncio.to_thread(
+            _answer_cached, _normalize_message(message), _cache_version
+        )
+    return await asyncio.to_thread(_answer_question, message)
+
+def _sse_event(payload: Dict[str, Any]) -> str:
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+async def _stream_chat_response(message: str, conversation_id: str):
+    """Yield the answer as server-sent events, paragraph by paragraph
+
+    The first paragraph goes on the wire as soon as the answer is
+    resolved instead of waiting for the full JSON body; the final event
+    carries the metadata a JSON client would get in one blob.
+    """
+    try:
+        response_text, sources, confidence = await _resolve_answer(message)
+    except Exception as e:
+        logger.error(f"Error retrieving documents: {e}")
+        response_text = _DEGRADED_MESSAGE
+        sources, confidence = [], 0.1
+
+    paragraphs = response_text.split('\n\n')
+    for i, paragraph in enumerate(paragraphs):
+        text = paragraph if i == len(paragraphs) - 1 else paragraph + '\n\n'
+        yield _sse_event({"type": "delta", "text": text})
+
+    yield _sse_event({
+        "type": "done",
+        "conversation_id": conversation_id,
+        "sources": list(sources),
+        "confidence_score": confidence
+    })
+
+@router.post("/", response_model=None)
+async def chat_endpoint(request: ChatRequest, http_request: Request):
+    """Main chat endpoint - processes user questions
+
+    Returns the usual ChatResponse JSON, or a server-sent event stream
+    when the client asks for one with Accept: text/event-stream.
+    """
     try:
         # Generate conversation ID if not provided
+        server_generated_id = not request.conversation_id
         conversation_id = request.conversation_id or str(uuid.uuid4())
-        
+
         logger.info(f"Processing chat request: {request.message[:50]}...")
-        
+
+        if 'text/event-stream' in http_request.headers.get('accept', ''):
+            return StreamingResponse(
+                _stream_chat_response(request.message, conversation_id),
+                media_type="text/event-stream"
+            )
+
         # For now, let's create a fallback response system since OpenAI API has quota issues
         # This shows how the system would work once API access is restored
-        
-        # Get relevant documents from vector store
         try:
-            relevant_docs = retriever.retrieve_relevant_docs(
-                query=request.message,
-                n_results=5,
-                min_relevance_score=0.1
-            )
-            
-            # Build context from retrieved documents
-            context = retriever.get_document_context(
-                query=request.message,
-                max_context_length=2000
-            )
-            
-            # Create response based on retrieved documents
-            if relevant_docs:
-                # Extract source URLs
-                sources = []
-                for doc in relevant_docs[:3]:  # Top 3 sources
-                    metadata = doc.get('metadata', {})
-                    source_url = metadata.get('source_url', '')
-                    title = metadata.get('title', 'Unknown')
-                    
-                    if source_url:
-                        sources.append(source_url)
-                
-                # For now, create a contextual response without OpenAI
-                response_text = create_fallback_response(request.message, relevant_docs)
-                
-                return ChatResponse(
-                    response=response_text,
-                    conversation_id=conversation_id,
-                    sources=sources,
-                    confidence_score=0.8 if relevant_docs else 0.3
-                )
-            else:
-                # No relevant documents found
-                return ChatResponse(
-                    response="I don't have specific information about that topic in my Core DNA knowledge base. Could you try rephrasing your question or ask about Core DNA's ecommerce platform, features, or services?",
-                    conversation_id=conversation_id,
-                    sources=[],
-                    confidence_score=0.1
+            # Retrieval is synchronous Chroma I/O; run it off the event
+            # loop so concurrent requests are not serialized
+            response_text, sources, confidence = await _resolve_answer(request.message)
+
+            if not sources and response_text == _NO_DOCS_MESSAGE \
+                    and server_generated_id:
+                return Response(
+                    content=_NO_DOCS_TEMPLATE % conversation_id.encode(),
+                    media_type="application/json"
                 )
-                
+
+            return ChatResponse(
+                response=response_text,
+                conversation_id=conversation_id,
+                sources=list(sources),
+                confidence_score=confidence
+            )
+
         except Exception as e:
             logger.error(f"Error retrieving documents: {e}")
             # Fallback to basic response
+            if server_generated_id:
+                return Response(
+                    content=_DEGRADED_TEMPLATE % conversation_id.encode(),
+                    media_type="application/json"
+                )
             return ChatResponse(
-                response="I'm having trouble accessing my knowledge base right now. Please try asking about Core DNA's ecommerce platform, content management, or integration capabilities.",
+                response=_DEGRADED_MESSAGE,
                 conversation_id=conversation_id,
                 sources=[],
                 confidence_score=0.1
             )
-            
+
     except Exception as e:
         logger.error(f"Chat endpoint error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
 
+# Upper bound on messages per /batch call, so one request cannot pin
+# every worker thread at once
+MAX_BATCH_SIZE = 48
+
+@router.post("/batch", response_model=ChatBatchResponse)
+async def chat_batch(request: ChatBatchRequest):
+    """Answer several chat messages in one request
+
+    Each message runs through the same cache/retrieval path as the
+    single-message endpoint, but concurrently, so an evaluation harness
+    or multi-tab flush pays roughly one round trip instead of one per
+    message.
+    """
+    if len(request.messages) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size is capped at {MAX_BATCH_SIZE} messages"
+        )
+
+    async def answer_one(item: ChatRequest) -> ChatResponse:
+        conversation_id = item.conversation_id or str(uuid.uuid4())
+        try:
+            response_text, sources, confidence = await _resolve_answer(item.message)
+        except Exception as e:
+            logger.error(f"Error retrieving documents: {e}")
+            return ChatResponse(
+                response=_DEGRADED_MESSAGE,
+                conversation_id=conversation_id,
+                sources=[],
+                confidence_score=0.1
+            )
+
+        return ChatResponse(
+            response=response_text,
+            conversation_id=conversation_id,
+            sources=list(sources),
+            confidence_score=confidence
+        )
+
+    responses = await asyncio.gather(*[
+        answer_one(item) for item in request.messages
+    ])
+    return ChatBatchResponse(responses=list(responses))
+
 def create_fallback_response(question: str, docs: List[Dict[str, Any]]) -> str:
     """Create a helpful response based on retrieved documents without OpenAI"""
     
@@ -112,74 +297,80 @@ def create_fallback_response(question: str, docs: List[Dict[str, Any]]) -> str:
         url = metadata.get('source_url', '')
         
         if text:
-            # Get first 200 characters as summary
-            summary = text[:200] + "..." if len(text) > 200 else text
+            # Indexed documents carry a precomputed summary; slice only
+            # for chunks indexed before that field existed
+            summary = metadata.get('summary_200') or (
+                text[:200] + "..." if len(text) > 200 else text
+            )
             doc_info.append({
                 'title': title,
                 'summary': summary,
                 'url': url
             })
     
-    # Create contextual response based on question type
-    if any(word in question_lower for word in ['what is', 'what are', 'define', 'explain']):
+    # Create contextual response based on question type. Each branch
+    # collects parts and the pieces are joined once at the end, instead
+    # of growing a string with repeated +=.
+    if _RE_DEFINITION.search(question_lower):
         # Definitional question
         if doc_info:
-            response = f"Based on Core DNA's documentation:\n\n{doc_info[0]['summary']}"
+            parts = [f"Based on Core DNA's documentation:\n", doc_info[0]['summary']]
             if len(doc_info) > 1:
-                response += f"\n\nAdditionally: {doc_info[1]['summary']}"
+                parts.append(f"\nAdditionally: {doc_info[1]['summary']}")
         else:
-            response = "I found some relevant information, but I'd need more context to provide a complete answer."
+            parts = ["I found some relevant information, but I'd need more context to provide a complete answer."]
             
-    elif any(word in question_lower for word in ['how to', 'how do', 'how can']):
+    elif _RE_HOWTO.search(question_lower):
         # How-to question
-        response = "Here's what I found about that process:\n\n"
+        parts = ["Here's what I found about that process:\n"]
         for info in doc_info:
-            if 'how' in info['summary'].lower() or 'step' in info['summary'].lower():
-                response += f"• {info['summary']}\n"
+            # One lowercase pass and one scan per summary, instead of a
+            # substring check (and .lower() copy) per keyword
+            if _RE_PROCESS.search(info['summary'].lower()):
+                parts.append(f"• {info['summary']}")
         
-        if response == "Here's what I found about that process:\n\n":
-            response = f"I found relevant information: {doc_info[0]['summary'] if doc_info else 'Please check the Core DNA documentation for detailed steps.'}"
+        if len(parts) == 1:  # no process-looking summaries made the cut
+            parts = [f"I found relevant information: {doc_info[0]['summary'] if doc_info else 'Please check the Core DNA documentation for detailed steps.'}"]
             
-    elif any(word in question_lower for word in ['features', 'capabilities', 'functionality']):
+    elif _RE_FEATURES.search(question_lower):
         # Feature question
-        response = "Core DNA offers these capabilities:\n\n"
+        parts = ["Core DNA offers these capabilities:\n"]
         for info in doc_info:
-            response += f"• {info['title']}: {info['summary'][:100]}...\n"
+            parts.append(f"• {info['title']}: {info['summary'][:100]}...")
             
-    elif any(word in question_lower for word in ['price', 'cost', 'pricing', 'plan']):
+    elif _RE_PRICING.search(question_lower):
         # Pricing question
-        response = "For pricing information, I'd recommend contacting Core DNA directly. "
+        lead = "For pricing information, I'd recommend contacting Core DNA directly. "
         if doc_info:
-            response += f"Here's some related information: {doc_info[0]['summary']}"
+            parts = [lead + f"Here's some related information: {doc_info[0]['summary']}"]
+        else:
+            parts = [lead]
             
     else:
         # General question
         if doc_info:
-            response = f"Here's what I found: {doc_info[0]['summary']}"
+            parts = [f"Here's what I found: {doc_info[0]['summary']}"]
             if len(doc_info) > 1:
-                response += f"\n\nRelated information: {doc_info[1]['summary']}"
+                parts.append(f"\nRelated information: {doc_info[1]['summary']}")
         else:
-            response = "I found some information related to your question, but I'd need more details to provide a specific answer."
+            parts = ["I found some information related to your question, but I'd need more details to provide a specific answer."]
     
-    # Add helpful ending
-    response += "\n\nFor more detailed information, you can check the specific Core DNA documentation pages I referenced."
-    
-    return response
+    return "\n".join(parts) + _RESPONSE_FOOTER
 
 @router.get("/status")
-async def chat_status():
+async def chat_status(retriever: DocumentRetriever = Depends(get_retriever)):
     """Get chat system status"""
     try:
-        # Check if vector store is working
-        vector_store = ChromaVectorStore()
-        collection_info = vector_store.get_collection_info()
-        
-        # Check if we can retrieve documents
-        test_results = retriever.retrieve_relevant_docs("test", n_results=1)
+        # The collection probe and the test retrieval are independent;
+        # run them concurrently against the retriever's shared store
+        collection_info, test_results = await asyncio.gather(
+            asyncio.to_thread(retriever.vector_store.get_collection_info),
+            asyncio.to_thread(retriever.retrieve_relevant_docs, "test", 1)
+        )
         
         return {
             "status": "operational",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "components": {
                 "vector_store": {
                     "status": "healthy",
@@ -199,18 +390,17 @@ async def chat_status():
         logger.error(f"Chat status check failed: {e}")
         return {
             "status": "degraded",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "error": str(e)
         }
 
 @router.get("/search")
-async def search_documents(q: str, limit: int = 5):
+async def search_documents(q: str, limit: int = 5,
+                           retriever: DocumentRetriever = Depends(get_retriever)):
     """Search documents in the knowledge base"""
     try:
-        results = retriever.retrieve_relevant_docs(
-            query=q,
-            n_results=limit,
-            min_relevance_score=0.1
+        results = await asyncio.to_thread(
+            retriever.retrieve_relevant_docs, q, limit, 0.1
         )
         
         # Format results for API response
@@ -222,7 +412,9 @@ async def search_documents(q: str, limit: int = 5):
                 'similarity_score': result.get('similarity_score', 0.0),
                 'source_url': metadata.get('source_url', ''),
                 'title': metadata.get('title', ''),
-                'source_type': 'blog' if '/blogs/' in metadata.get('source_url', '') else 'feature'
+                'source_type': metadata.get('source_type') or (
+                    'blog' if '/blogs/' in metadata.get('source_url', '') else 'feature'
+                )
             })
         
         return {
@@ -1,28 +1,73 @@
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
+import asyncio
 import os
+import time
 import logging
 
 try:
     from ...config.settings import settings
     from ..models.schemas import HealthResponse, IndexStatus
-    from ...vector_store.chroma_store import ChromaVectorStore
+    from ...vector_store.chroma_store import get_store
+    from ...utils.time import now_iso
 except ImportError:
     import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
     from config.settings import settings
     from api.models.schemas import HealthResponse, IndexStatus
-    from vector_store.chroma_store import ChromaVectorStore
+    from vector_store.chroma_store import get_store
+    from utils.time import now_iso
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Health endpoints get polled by monitors; 5 seconds of staleness is
+# fine there, so the stat() probes and the Chroma collection count are
+# cached instead of re-done per probe.
+_TTL_SECONDS = 5.0
+
+_PROBE_PATHS = (
+    "data",
+    "data/processed",
+    settings.chroma_db_path,
+    "data/raw/coredna_scraped_data.json.gz",
+    "data/processed/coredna_processed_data.json.gz",
+    "data/processed/coredna_chunks.json",
+)
+
+_fs_snapshot = None
+_fs_snapshot_time = 0.0
+
+def _filesystem_snapshot() -> dict:
+    """path -> exists for the data files, refreshed at most per TTL"""
+    global _fs_snapshot, _fs_snapshot_time
+
+    now = time.monotonic()
+    if _fs_snapshot is None or now - _fs_snapshot_time >= _TTL_SECONDS:
+        _fs_snapshot = {path: os.path.exists(path) for path in _PROBE_PATHS}
+        _fs_snapshot_time = now
+    return _fs_snapshot
+
+_collection_info = None
+_collection_info_time = 0.0
+
+def _cached_collection_info() -> dict:
+    """Collection info from the shared store, refreshed at most per TTL"""
+    global _collection_info, _collection_info_time
+
+    now = time.monotonic()
+    if _collection_info is None or now - _collection_info_time >= _TTL_SECONDS:
+        _collection_info = get_store().get_collection_info()
+        _collection_info_time = now
+    return _collection_info
+
 @router.get("/", response_model=HealthResponse)
 async def health_check():
     """Basic health check endpoint"""
     try:
-        # Check if vector database directory exists
-        db_status = "healthy" if os.path.exists(settings.chroma_db_path) else "missing"
+        # Check if vector database directory exists (TTL snapshot)
+        snapshot = await asyncio.to_thread(_filesystem_snapshot)
+        db_status = "healthy" if snapshot[settings.chroma_db_path] else "missing"
         
         return HealthResponse(
             status="healthy",
@@ -38,8 +83,8 @@ async def health_check():
 async def database_status():
     """Check vector database status"""
     try:
-        vector_store = ChromaVectorStore()
-        info = vector_store.get_collection_info()
+        # Shared store singleton; Chroma calls run off the event loop
+        info = await asyncio.to_thread(_cached_collection_info)
         
         return IndexStatus(
             total_documents=info.get('document_count', 0),
@@ -58,31 +103,35 @@ async def database_status():
 async def detailed_health():
     """Detailed system health information"""
     try:
-        # Check database
+        # The Chroma probe and the filesystem snapshot are independent,
+        # so they run concurrently: wall clock is the slower of the two
+        # instead of their sum. The snapshot keeps repeated liveness
+        # checks to a dict lookup instead of six stat calls.
+        info, snapshot = await asyncio.gather(
+            asyncio.to_thread(_cached_collection_info),
+            asyncio.to_thread(_filesystem_snapshot),
+            return_exceptions=True
+        )
+        if isinstance(snapshot, BaseException):
+            raise snapshot
+
         db_healthy = False
         document_count = 0
-        
-        try:
-            vector_store = ChromaVectorStore()
-            info = vector_store.get_collection_info()
+        if isinstance(info, BaseException):
+            logger.warning(f"Database check failed: {info}")
+        else:
             document_count = info.get('document_count', 0)
             db_healthy = document_count > 0
-        except Exception as e:
-            logger.warning(f"Database check failed: {e}")
-        
-        # Check file system
-        data_dir_exists = os.path.exists("data")
-        processed_dir_exists = os.path.exists("data/processed")
-        vector_db_dir_exists = os.path.exists(settings.chroma_db_path)
-        
-        # Check if scraped data exists
-        scraped_data_exists = os.path.exists("data/raw/coredna_scraped_data.json")
-        processed_data_exists = os.path.exists("data/processed/coredna_processed_data.json")
-        chunks_exist = os.path.exists("data/processed/coredna_chunks.json")
+        data_dir_exists = snapshot["data"]
+        processed_dir_exists = snapshot["data/processed"]
+        vector_db_dir_exists = snapshot[settings.chroma_db_path]
+        scraped_data_exists = snapshot["data/raw/coredna_scraped_data.json.gz"]
+        processed_data_exists = snapshot["data/processed/coredna_processed_data.json.gz"]
+        chunks_exist = snapshot["data/processed/coredna_chunks.json"]
         
         return {
             "status": "healthy" if db_healthy else "degraded",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "version": "1.0.0",
             "components": {
                 "database": {
@@ -1,33 +1,49 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache
 from typing import Optional
-import os
 from dotenv import load_dotenv
 
+# Modules like chroma_store read tuning knobs straight from os.getenv,
+# so .env still has to land in the process environment, not just in
+# this Settings instance.
 load_dotenv()
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env")
+
     # API Keys
-    openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
-    
+    openai_api_key: str = ""
+
     # Database
-    chroma_db_path: str = os.getenv("CHROMA_DB_PATH", "./data/vector_db")
-    
+    chroma_db_path: str = "./data/vector_db"
+
     # API Configuration
-    api_host: str = os.getenv("API_HOST", "0.0.0.0")
-    api_port: int = int(os.getenv("API_PORT", "8000"))
-    
+    api_host: str = "0.0.0.0"
+    api_port: int = 8000
+    # Serve repeated chat questions from an in-process cache instead of
+    # re-running retrieval
+    enable_response_cache: bool = True
+    # Run a throwaway retrieval at startup so the first real request
+    # does not pay for index warm-up
+    warmup_on_start: bool = True
+
     # Scraping Configuration
-    coredna_base_url: str = os.getenv("COREDNA_BASE_URL", "https://www.coredna.com")
-    max_pages: int = int(os.getenv("MAX_PAGES", "200"))
-    scraping_delay: float = float(os.getenv("SCRAPING_DELAY", "1"))
-    
+    coredna_base_url: str = "https://www.coredna.com"
+    max_pages: int = 200
+    scraping_delay: float = 1.0
+
     # LlamaIndex Configuration
-    embedding_model: str = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
-    llm_model: str = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
-    chunk_size: int = int(os.getenv("CHUNK_SIZE", "1000"))
-    chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "200"))
-    
-    class Config:
-        env_file = ".env"
-
-settings = Settings()
\ No newline at end of file
+    # text-embedding-3-small truncated to 512 dims: ~5x cheaper than
+    # ada-002 and a third of the vector storage/bandwidth
+    embedding_model: str = "text-embedding-3-small"
+    embedding_dimensions: int = 512
+    llm_model: str = "gpt-3.5-turbo"
+    chunk_size: int = 1000
+    chunk_overlap: int = 200
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse the environment once per process"""
+    return Settings()
+
+settings = get_settings()
@@ -1,58 +1,179 @@
 from typing import List, Dict, Any, Optional
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
 
 try:
-    from ..vector_store.chroma_store import ChromaVectorStore
+    from ..vector_store.chroma_store import ChromaVectorStore, get_store
     from ..config.settings import settings
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from vector_store.chroma_store import ChromaVectorStore
+    from vector_store.chroma_store import ChromaVectorStore, get_store
     from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+class QueryCache:
+    """Bounded LRU cache for retrieval results with a staleness TTL
+
+    Keyed on the normalized query text, so repeat and
+    differently-whitespaced queries skip the embedding and ANN search
+    entirely. Entries expire after ttl_seconds so a reindex cannot
+    serve stale results for long.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, results = entry
+        if time.monotonic() - stored_at >= self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return results
+
+    def put(self, key, results) -> None:
+        self._entries[key] = (time.monotonic(), results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
 class DocumentRetriever:
-    def __init__(self, collection_name: str = "coredna_docs"):
+    def __init__(self, collection_name: str = "coredna_docs",
+                 vector_store: ChromaVectorStore = None):
         self.collection_name = collection_name
-        self.vector_store = ChromaVectorStore(collection_name=collection_name)
+        # Reuse the process-wide store by default; every fresh
+        # ChromaVectorStore reopens the persistent client and its HNSW
+        # index, which is both slow and doubles the index in memory.
+        if vector_store is not None:
+            self.vector_store = vector_store
+        elif collection_name == "coredna_docs":
+            self.vector_store = get_store()
+        else:
+            self.vector_store = ChromaVectorStore(collection_name=collection_name)
+        self._query_cache: Optional[QueryCache] = None
+        self._stats_cache: Optional[tuple] = None
+
+    def enable_query_cache(self, maxsize: int = 1024,
+                           ttl_seconds: float = 300.0) -> None:
+        """Serve repeat queries from an in-process cache"""
+        self._query_cache = QueryCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    def clear_query_cache(self) -> None:
+        """Drop cached results, e.g. after reindexing the collection"""
+        if self._query_cache is not None:
+            self._query_cache.clear()
         
-    def retrieve_relevant_docs(self, query: str, n_results: int = 5, 
-                             min_relevance_score: float = 0.0) -> List[Dict[str, Any]]:
-        """Retrieve relevant documents for a query"""
+    def retrieve_relevant_docs(self, query: str, n_results: int = 5,
+                             min_relevance_score: float = 0.0,
+                             raise_on_error: bool = False) -> List[Dict[str, Any]]:
+        """Retrieve relevant documents for a query
+
+        By default failures are logged and return [], which callers
+        treat as "no matches". Pass raise_on_error=True where the two
+        must stay distinguishable — e.g. ahead of a cache that must not
+        store a transient outage as a durable empty answer.
+        """
         try:
-            # Query the vector store
-            results = self.vector_store.query(
-                query_text=query,
-                n_results=n_results,
-                include_metadata=True
-            )
+            # Raw (unfiltered) results are cached per normalized query,
+            # so callers with different relevance thresholds share one
+            # Chroma lookup
+            cache_key = None
+            results = None
+            if self._query_cache is not None:
+                cache_key = (' '.join(query.lower().split()), n_results)
+                results = self._query_cache.get(cache_key)
+
+            if results is None:
+                # Query the vector store
+                results = self.vector_store.query(
+                    query_text=query,
+                    n_results=n_results,
+                    include_metadata=True
+                )
+                if cache_key is not None and results:
+                    self._query_cache.put(cache_key, results)
             
-            # Filter by relevance score if specified
-            filtered_results = []
-            for result in results:
-                # ChromaDB returns distance (lower is better), convert to similarity score
-                similarity_score = 1.0 - result['distance']
-                
-                if similarity_score >= min_relevance_score:
-                    result['similarity_score'] = similarity_score
-                    filtered_results.append(result)
+            # Filter by relevance score if specified. ChromaDB returns
+            # distance (lower is better); the equivalent threshold on
+            # distance avoids converting scores for results that are
+            # discarded anyway.
+            max_distance = 1.0 - min_relevance_score
+            filtered_results = [result for result in results
+                                if result['distance'] <= max_distance]
+            for result in filtered_results:
+                result['similarity_score'] = 1.0 - result['distance']
             
             logger.info(f"Retrieved {len(filtered_results)} relevant documents for query: {query[:50]}...")
             return filtered_results
             
         except Exception as e:
+            if raise_on_error:
+                raise
             logger.error(f"Error retrieving documents: {e}")
             return []
 
+    def retrieve_and_contextualize(self, query: str, n_results: int = 5,
+                                   min_relevance_score: float = 0.0,
+                                   max_context_length: int = 4000,
+                                   context_pool: int = 10,
+                                   raise_on_error: bool = False) -> tuple:
+        """Retrieve documents and build their context in one query
+
+        The chat path needs both the top documents and a concatenated
+        context string; fetching them separately embeds the same query
+        and hits Chroma twice. This queries once for a pool of
+        context_pool documents, slices the top n_results that clear
+        min_relevance_score, and builds the context from the full pool.
+        Returns (docs, context).
+        """
+        pool = self.retrieve_relevant_docs(query, n_results=max(n_results, context_pool),
+                                           raise_on_error=raise_on_error)
+
+        docs = [
+            doc for doc in pool
+            if doc['similarity_score'] >= min_relevance_score
+        ][:n_results]
+
+        return docs, self._build_context(pool, max_context_length)
+
+    async def aretrieve_relevant_docs(self, query: str, n_results: int = 5,
+                                      min_relevance_score: float = 0.0) -> List[Dict[str, Any]]:
+        """retrieve_relevant_docs off the event loop, for fan-out callers"""
+        return await asyncio.to_thread(
+            self.retrieve_relevant_docs, query, n_results, min_relevance_score
+        )
+
     def get_document_context(self, query: str, max_context_length: int = 4000) -> str:
         """Get concatenated context from relevant documents"""
+        _, context = self.retrieve_and_contextualize(
+            query, max_context_length=max_context_length
+        )
+        return context
+
+    def _build_context(self, docs: List[Dict[str, Any]], max_context_length: int) -> str:
+        """Concatenate document texts with source headers up to a length cap"""
         try:
-            # Retrieve relevant documents
-            docs = self.retrieve_relevant_docs(query, n_results=10)
-            
             if not docs:
                 return ""
             
@@ -87,32 +208,66 @@ class DocumentRetriever:
             logger.error(f"Error building document context: {e}")
             return ""
 
-    def find_similar_questions(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
-        """Find documents that might contain answers to similar questions"""
+    async def afind_similar_questions(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
+        """Find documents that might contain answers to similar questions
+
+        The plain query and the FAQ-enhanced query are independent
+        Chroma lookups, so they run concurrently and their results are
+        merged by source chunk, best distance first.
+        """
         try:
             # Enhance query to find FAQ-like content
             enhanced_query = f"question answer FAQ help guide how to {query}"
-            
-            docs = self.retrieve_relevant_docs(enhanced_query, n_results=n_results)
-            
+
+            base_docs, enhanced_docs = await asyncio.gather(
+                self.aretrieve_relevant_docs(query, n_results),
+                self.aretrieve_relevant_docs(enhanced_query, n_results)
+            )
+
+            # Merge both result lists, dropping duplicate chunks
+            seen = set()
+            merged = []
+            for doc in sorted(base_docs + enhanced_docs,
+                              key=lambda doc: doc['distance']):
+                metadata = doc.get('metadata') or {}
+                key = (metadata.get('source_url'), metadata.get('chunk_id')) \
+                    if metadata.get('source_url') else doc['text']
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append(doc)
+
             # Filter for documents that seem to contain Q&A content
             qa_docs = []
-            for doc in docs:
+            for doc in merged:
                 text = doc['text'].lower()
                 if any(keyword in text for keyword in ['how to', 'what is', 'why', 'when', 'where', 'question', 'answer', 'faq']):
                     qa_docs.append(doc)
             
-            return qa_docs
+            return qa_docs[:n_results]
             
         except Exception as e:
             logger.error(f"Error finding similar questions: {e}")
             return []
 
+    def find_similar_questions(self, query: str, n_results: int = 3) -> List[Dict[str, Any]]:
+        """Synchronous wrapper around afind_similar_questions"""
+        return asyncio.run(self.afind_similar_questions(query, n_results))
+
+    # Stats barely move between calls, but each one embeds the sampling
+    # query (a paid API round-trip) and pulls 50 documents
+    _STATS_TTL_SECONDS = 60.0
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the document collection"""
         try:
+            if self._stats_cache is not None:
+                cached_at, cached_stats = self._stats_cache
+                if time.monotonic() - cached_at < self._STATS_TTL_SECONDS:
+                    return cached_stats
+
             info = self.vector_store.get_collection_info()
-            
+
             # Get a sample of documents to analyze
             sample_docs = self.vector_store.query("Core DNA platform", n_results=50)
             
@@ -149,9 +304,10 @@ class DocumentRetriever:
                 }
             else:
                 stats = info
-            
+
+            self._stats_cache = (time.monotonic(), stats)
             return stats
-            
+
         except Exception as e:
             logger.error(f"Error getting collection stats: {e}")
             return {}
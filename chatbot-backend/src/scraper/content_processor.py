@@ -1,12 +1,38 @@
 import re
-import json
+import gzip
+import orjson
 import os
-from typing import List, Dict, Any
+from hashlib import blake2b
+from typing import Iterator, List, Dict, Any
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
+# clean_text runs per field per document, so its patterns are compiled
+# once here. The two spacing-around-punctuation steps are fused into a
+# single substitution, and whitespace collapsing happens once at the
+# end via str.split instead of leading and trailing regex passes.
+_CLEAN_PATTERNS = [
+    # Remove special characters but keep basic punctuation
+    (re.compile(r'[^\w\s\.,\!\?\-\(\)\[\]\:\;\"\'\/]'), ''),
+    # Remove repeated punctuation
+    (re.compile(r'[\.]{2,}'), '.'),
+    (re.compile(r'[\!\?]{2,}'), '!'),
+    # Fix spacing around punctuation
+    (re.compile(r'\s*([,\.!?;:])\s*'), r'\1 '),
+]
+
+# Navigation/boilerplate markers that disqualify a page. One compiled
+# alternation scans the text once instead of one substring pass per
+# indicator; substring semantics are unchanged.
+_LOW_VALUE_INDICATORS = (
+    'cookie policy', 'privacy policy', 'terms of service',
+    'page not found', '404', 'error', 'maintenance',
+    'coming soon', 'under construction'
+)
+_LOW_VALUE_RE = re.compile('|'.join(map(re.escape, _LOW_VALUE_INDICATORS)))
+
 @dataclass
 class ProcessedDocument:
     url: str
@@ -14,33 +40,89 @@ class ProcessedDocument:
     content: str
     metadata: Dict[str, Any]
 
+class ProcessedDocuments:
+    """Struct-of-arrays store for processed documents
+
+    Four parallel lists instead of one object per document: the bulk
+    passes (chunking, saving) each read a field or two per row, and the
+    columnar layout drops the per-document object overhead. Indexing
+    returns a ProcessedDocument view for row-at-a-time callers.
+    """
+
+    __slots__ = ('urls', 'titles', 'contents', 'metadatas')
+
+    def __init__(self):
+        self.urls: List[str] = []
+        self.titles: List[str] = []
+        self.contents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+
+    def append(self, url: str, title: str, content: str,
+               metadata: Dict[str, Any]) -> None:
+        self.urls.append(url)
+        self.titles.append(title)
+        self.contents.append(content)
+        self.metadatas.append(metadata)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __getitem__(self, index: int) -> ProcessedDocument:
+        return ProcessedDocument(
+            url=self.urls[index],
+            title=self.titles[index],
+            content=self.contents[index],
+            metadata=self.metadatas[index]
+        )
+
+def _content_fingerprint(text: str) -> str:
+    """Short stable digest of page content for change detection"""
+    return blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def _open_artifact(path: str, mode: str):
+    """Open a pipeline artifact, transparently gzipped for .gz paths
+
+    The JSON artifacts are mostly repeated keys and HTML-derived text,
+    which gzip shrinks several-fold; level 3 compresses faster than the
+    disk write it saves.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, compresslevel=3)
+    return open(path, mode)
+
 class ContentProcessor:
+    # Side-file mapping source URL -> content fingerprint from the last
+    # run; pages whose fingerprint is unchanged reuse their previous
+    # processed record instead of being cleaned again
+    _FINGERPRINTS_PATH = os.path.join("data", "processed", "coredna_fingerprints.json")
+    _PROCESSED_PATH = os.path.join("data", "processed", "coredna_processed_data.json.gz")
+
     def __init__(self):
-        self.processed_docs: List[ProcessedDocument] = []
+        self.processed_docs = ProcessedDocuments()
+        self._fingerprints: Dict[str, str] = {}
+
+    def _load_previous_run(self):
+        """Fingerprints and processed records persisted by the last run"""
+        try:
+            with open(self._FINGERPRINTS_PATH, 'rb') as f:
+                fingerprints = orjson.loads(f.read())
+            with _open_artifact(self._PROCESSED_PATH, 'rb') as f:
+                records = {record['url']: record for record in orjson.loads(f.read())}
+        except (OSError, ValueError):
+            # First run, or a partial previous run: reprocess everything
+            return {}, {}
+        return fingerprints, records
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text content"""
         if not text:
             return ""
-            
-        # Remove extra whitespace and newlines
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.,\!\?\-\(\)\[\]\:\;\"\'\/]', '', text)
-        
-        # Remove repeated punctuation
-        text = re.sub(r'[\.]{2,}', '.', text)
-        text = re.sub(r'[\!\?]{2,}', '!', text)
-        
-        # Fix spacing around punctuation
-        text = re.sub(r'\s+([,\.!?;:])', r'\1', text)
-        text = re.sub(r'([,\.!?;:])\s*', r'\1 ', text)
-        
-        # Remove extra spaces
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+
+        for pattern, replacement in _CLEAN_PATTERNS:
+            text = pattern.sub(replacement, text)
+
+        # Collapse whitespace runs and strip the ends
+        return ' '.join(text.split())
 
     def extract_key_information(self, content: str, title: str, headers: List[str]) -> str:
         """Extract and organize key information from content"""
@@ -68,44 +150,39 @@ class ContentProcessor:
 
     def is_valuable_content(self, content: str, title: str) -> bool:
         """Determine if content is valuable enough to include"""
-        # Skip if too short
+        # Cheap length gates first, so most rejects never pay for the
+        # lowercased copy or the indicator scan
         if len(content.strip()) < 100:
             return False
-            
-        # Skip if mostly navigation or boilerplate
-        low_value_indicators = [
-            'cookie policy', 'privacy policy', 'terms of service',
-            'page not found', '404', 'error', 'maintenance',
-            'coming soon', 'under construction'
-        ]
-        
-        content_lower = content.lower()
-        title_lower = title.lower() if title else ""
-        
-        for indicator in low_value_indicators:
-            if indicator in content_lower or indicator in title_lower:
-                return False
-                
+
         # Check content-to-navigation ratio
-        content_words = len(content.split())
-        if content_words < 50:
+        if len(content.split()) < 50:
             return False
-            
+
+        # Skip if mostly navigation or boilerplate
+        if _LOW_VALUE_RE.search(content.lower()):
+            return False
+        if title and _LOW_VALUE_RE.search(title.lower()):
+            return False
+
         return True
 
-    def process_scraped_data(self, input_file: str) -> List[ProcessedDocument]:
+    def process_scraped_data(self, input_file: str) -> ProcessedDocuments:
         """Process scraped data from JSON file"""
         logger.info(f"Processing scraped data from: {input_file}")
         
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                scraped_data = json.load(f)
+            with _open_artifact(input_file, 'rb') as f:
+                scraped_data = orjson.loads(f.read())
         except Exception as e:
             logger.error(f"Error reading scraped data: {e}")
             return []
 
+        seen_fingerprints, previous_records = self._load_previous_run()
+
         processed_count = 0
         skipped_count = 0
+        unchanged_count = 0
         
         for page_data in scraped_data:
             url = page_data.get('url', '')
@@ -114,6 +191,22 @@ class ContentProcessor:
             meta_description = page_data.get('meta_description', '')
             headers = page_data.get('headers', [])
             timestamp = page_data.get('timestamp', '')
+
+            # Unchanged since the last run: reuse the stored record and
+            # skip cleaning entirely. Old raw files without a hash get
+            # fingerprinted here.
+            content_hash = page_data.get('content_hash') or _content_fingerprint(content)
+            previous = previous_records.get(url)
+            if previous is not None and seen_fingerprints.get(url) == content_hash:
+                self.processed_docs.append(
+                    url=previous['url'],
+                    title=previous['title'],
+                    content=previous['content'],
+                    metadata=previous['metadata']
+                )
+                self._fingerprints[url] = content_hash
+                unchanged_count += 1
+                continue
             
             # Skip if not valuable content
             if not self.is_valuable_content(content, title):
@@ -135,112 +228,148 @@ class ContentProcessor:
             }
             
             # Create processed document
-            processed_doc = ProcessedDocument(
+            self.processed_docs.append(
                 url=url,
                 title=self.clean_text(title),
                 content=processed_content,
                 metadata=metadata
             )
-            
-            self.processed_docs.append(processed_doc)
+            self._fingerprints[url] = content_hash
             processed_count += 1
             
-        logger.info(f"Processing complete. Processed: {processed_count}, Skipped: {skipped_count}")
+        logger.info(f"Processing complete. Processed: {processed_count}, "
+                    f"Unchanged (reused): {unchanged_count}, Skipped: {skipped_count}")
         return self.processed_docs
 
     def save_processed_data(self, output_path: str = None) -> str:
         """Save processed documents to JSON file"""
         if not output_path:
-            output_path = os.path.join("data", "processed", "coredna_processed_data.json")
-            
+            output_path = self._PROCESSED_PATH
+
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Convert to serializable format
-        data_dict = []
-        for doc in self.processed_docs:
-            data_dict.append({
-                'url': doc.url,
-                'title': doc.title,
-                'content': doc.content,
-                'metadata': doc.metadata
-            })
-            
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data_dict, f, indent=2, ensure_ascii=False)
+
+        # Convert to serializable format, straight off the columns
+        docs = self.processed_docs
+        data_dict = [
+            {'url': url, 'title': title, 'content': content, 'metadata': metadata}
+            for url, title, content, metadata in zip(
+                docs.urls, docs.titles, docs.contents, docs.metadatas)
+        ]
+
+        with _open_artifact(output_path, 'wb') as f:
+            f.write(orjson.dumps(data_dict, option=orjson.OPT_INDENT_2))
+
+        # Persist fingerprints so the next run can skip unchanged pages
+        if self._fingerprints:
+            with open(self._FINGERPRINTS_PATH, 'wb') as f:
+                f.write(orjson.dumps(self._fingerprints))
             
         logger.info(f"Processed data saved to: {output_path}")
         return output_path
 
+    def _chunk_document(self, content: str, title: str, metadata: Dict[str, Any],
+                        max_chunk_size: int, overlap: int) -> List[Dict[str, Any]]:
+        """Split one document into chunks, with total_chunks filled in"""
+        # If content is smaller than max_chunk_size, keep as single chunk
+        if len(content) <= max_chunk_size:
+            return [{
+                'text': content,
+                'metadata': {
+                    **metadata,
+                    'chunk_id': 0,
+                    'total_chunks': 1,
+                    'title': title
+                }
+            }]
+
+        # Split into overlapping chunks
+        words = content.split()
+        chunk_size_words = max_chunk_size // 5  # Rough estimate: 5 chars per word
+        overlap_words = overlap // 5
+
+        # Single-space the content once and precompute each word's
+        # character offset: chunk texts become direct string slices
+        # instead of a per-chunk word-list slice joined back together,
+        # which re-copied every overlapping word.
+        normalized = ' '.join(words)
+        word_offsets = [0]
+        for word in words:
+            word_offsets.append(word_offsets[-1] + len(word) + 1)
+
+        doc_chunks = []
+        chunk_id = 0
+        start_idx = 0
+
+        while start_idx < len(words):
+            end_idx = min(start_idx + chunk_size_words, len(words))
+            chunk_text = normalized[word_offsets[start_idx]:word_offsets[end_idx] - 1]
+
+            doc_chunks.append({
+                'text': chunk_text,
+                'metadata': {
+                    **metadata,
+                    'chunk_id': chunk_id,
+                    'title': title,
+                    'chunk_start': start_idx,
+                    'chunk_end': end_idx
+                }
+            })
+
+            # Move start index with overlap
+            start_idx = end_idx - overlap_words
+            chunk_id += 1
+
+            # Break if we've reached the end
+            if end_idx >= len(words):
+                break
+
+        for chunk in doc_chunks:
+            chunk['metadata']['total_chunks'] = len(doc_chunks)
+
+        return doc_chunks
+
+    def iter_chunk_batches(self, batch_size: int = 250, max_chunk_size: int = 1000,
+                           overlap: int = 200) -> Iterator[List[Dict[str, Any]]]:
+        """Yield chunks in insert-sized batches
+
+        A document's chunks are contiguous, so total_chunks can be
+        finalized per document and batches emitted as soon as they fill,
+        instead of materializing the whole corpus before the first
+        insert. batch_size defaults to 250, Chroma's documented batch
+        sweet spot.
+        """
+        total_chunks = 0
+        batch: List[Dict[str, Any]] = []
+
+        docs = self.processed_docs
+        for content, title, metadata in zip(docs.contents, docs.titles,
+                                            docs.metadatas):
+            batch.extend(self._chunk_document(content, title, metadata,
+                                              max_chunk_size, overlap))
+            while len(batch) >= batch_size:
+                yield batch[:batch_size]
+                total_chunks += batch_size
+                batch = batch[batch_size:]
+
+        if batch:
+            total_chunks += len(batch)
+            yield batch
+
+        logger.info(f"Created {total_chunks} text chunks from {len(self.processed_docs)} documents")
+
     def create_text_chunks(self, max_chunk_size: int = 1000, overlap: int = 200) -> List[Dict[str, Any]]:
         """Split processed documents into chunks for vector indexing"""
-        chunks = []
-        
-        for doc in self.processed_docs:
-            content = doc.content
-            
-            # If content is smaller than max_chunk_size, keep as single chunk
-            if len(content) <= max_chunk_size:
-                chunks.append({
-                    'text': content,
-                    'metadata': {
-                        **doc.metadata,
-                        'chunk_id': 0,
-                        'total_chunks': 1,
-                        'title': doc.title
-                    }
-                })
-                continue
-            
-            # Split into overlapping chunks
-            words = content.split()
-            chunk_size_words = max_chunk_size // 5  # Rough estimate: 5 chars per word
-            overlap_words = overlap // 5
-            
-            chunk_id = 0
-            start_idx = 0
-            
-            while start_idx < len(words):
-                end_idx = min(start_idx + chunk_size_words, len(words))
-                chunk_words = words[start_idx:end_idx]
-                chunk_text = ' '.join(chunk_words)
-                
-                chunks.append({
-                    'text': chunk_text,
-                    'metadata': {
-                        **doc.metadata,
-                        'chunk_id': chunk_id,
-                        'title': doc.title,
-                        'chunk_start': start_idx,
-                        'chunk_end': end_idx
-                    }
-                })
-                
-                # Move start index with overlap
-                start_idx = end_idx - overlap_words
-                chunk_id += 1
-                
-                # Break if we've reached the end
-                if end_idx >= len(words):
-                    break
-                    
-        # Update total_chunks for each document
-        url_chunk_counts = {}
-        for chunk in chunks:
-            url = chunk['metadata']['source_url']
-            url_chunk_counts[url] = url_chunk_counts.get(url, 0) + 1
-            
-        for chunk in chunks:
-            url = chunk['metadata']['source_url']
-            chunk['metadata']['total_chunks'] = url_chunk_counts[url]
-            
-        logger.info(f"Created {len(chunks)} text chunks from {len(self.processed_docs)} documents")
+        chunks: List[Dict[str, Any]] = []
+        for batch in self.iter_chunk_batches(max_chunk_size=max_chunk_size,
+                                             overlap=overlap):
+            chunks.extend(batch)
         return chunks
 
 if __name__ == "__main__":
     processor = ContentProcessor()
     
     # Process scraped data
-    input_file = os.path.join("data", "raw", "coredna_scraped_data.json")
+    input_file = os.path.join("data", "raw", "coredna_scraped_data.json.gz")
     if os.path.exists(input_file):
         processor.process_scraped_data(input_file)
         processor.save_processed_data()
@@ -248,8 +377,8 @@ if __name__ == "__main__":
         # Create chunks
         chunks = processor.create_text_chunks()
         chunks_output = os.path.join("data", "processed", "coredna_chunks.json")
-        with open(chunks_output, 'w', encoding='utf-8') as f:
-            json.dump(chunks, f, indent=2, ensure_ascii=False)
+        with open(chunks_output, 'wb') as f:
+            f.write(orjson.dumps(chunks, option=orjson.OPT_INDENT_2))
         logger.info(f"Text chunks saved to: {chunks_output}")
     else:
         logger.error(f"Input file not found: {input_file}")
\ No newline at end of file
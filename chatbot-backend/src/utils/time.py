@@ -0,0 +1,17 @@
+from datetime import datetime
+import time
+
+# Response timestamps only need second resolution, so the ISO string is
+# reformatted at most once per second instead of on every request.
+_last_second = 0
+_last_iso = ''
+
+def now_iso() -> str:
+    """Current local time as an ISO string, cached per second"""
+    global _last_second, _last_iso
+
+    second = int(time.time())
+    if second != _last_second or not _last_iso:
+        _last_second = second
+        _last_iso = datetime.fromtimestamp(second).isoformat()
+    return _last_iso
@@ -1,8 +1,19 @@
 import chromadb
 from chromadb.config import Settings
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import math
+import orjson
 import os
-import json
 import logging
+import queue
+import random
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -15,135 +26,789 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+class SemanticQueryCache:
+    """Bounded cache of query results keyed by query embedding
+
+    Chat traffic repeats itself semantically more than textually, so
+    entries match on cosine similarity: a probe whose embedding is
+    within similarity_threshold of a cached query reuses its results
+    without touching Chroma. Pure-Python dot products keep this
+    dependency-free; at the default 128-entry bound the probe scan is
+    still far cheaper than the HNSW search plus result formatting it
+    replaces. Entries expire after ttl_seconds so reindexing cannot
+    serve stale hits for long.
+    """
+
+    def __init__(self, maxsize: int = 128, similarity_threshold: float = 0.95,
+                 ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (stored_at, int8_embedding, scale, shape, results);
+        # keys are insertion counters, recency is tracked by
+        # OrderedDict order
+        self._entries: OrderedDict = OrderedDict()
+        self._next_key = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(embedding: List[float]) -> Optional[array]:
+        """Normalized copy as a float32 array: 4 bytes per component
+        resident instead of a 28-byte boxed float each"""
+        norm = math.sqrt(sum(value * value for value in embedding))
+        if norm == 0.0:
+            return None
+        return array('f', (value / norm for value in embedding))
+
+    @staticmethod
+    def _quantize(unit_embedding: array):
+        """Per-vector int8 quantization of a unit vector
+
+        One byte per component resident instead of four; the returned
+        scale turns an int dot product back into a cosine similarity.
+        Worst-case rounding error is ~0.4% of the largest component,
+        well inside the slack the similarity threshold leaves.
+        """
+        scale = max(abs(value) for value in unit_embedding)
+        if scale == 0.0:
+            return None, 0.0
+        quantized = array('b', (round(value / scale * 127)
+                                for value in unit_embedding))
+        return quantized, scale / 127.0
+
+    def get(self, embedding: List[float], shape) -> Optional[List[Dict[str, Any]]]:
+        """Results cached for the nearest similar query, or None"""
+        probe = self._unit(embedding)
+        if probe is None:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            expired = [key for key, entry in self._entries.items()
+                       if now - entry[0] >= self.ttl_seconds]
+            for key in expired:
+                del self._entries[key]
+
+            best_key = None
+            best_similarity = self.similarity_threshold
+            for key, (_, quantized, scale, entry_shape, _) in self._entries.items():
+                if entry_shape != shape:
+                    continue
+                similarity = scale * sum(a * b for a, b in zip(probe, quantized))
+                if similarity >= best_similarity:
+                    best_key = key
+                    best_similarity = similarity
+
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key][4]
+
+    def put(self, embedding: List[float], shape,
+            results: List[Dict[str, Any]]) -> None:
+        unit_embedding = self._unit(embedding)
+        if unit_embedding is None:
+            return
+        quantized, scale = self._quantize(unit_embedding)
+        if quantized is None:
+            return
+
+        with self._lock:
+            self._entries[self._next_key] = (
+                time.monotonic(), quantized, scale, shape, results
+            )
+            self._next_key += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def save(self, path: str) -> None:
+        """Snapshot live entries to disk so a restart can reuse them
+
+        Entries carry their remaining TTL rather than the monotonic
+        timestamp, which is meaningless in another process. The write
+        goes through a temp file and os.replace so a crash mid-write
+        never leaves a truncated snapshot.
+        """
+        with self._lock:
+            now = time.monotonic()
+            entries = [
+                {
+                    'expires_in': self.ttl_seconds - (now - stored_at),
+                    'embedding': list(quantized),
+                    'scale': scale,
+                    'shape': list(shape),
+                    'results': results,
+                }
+                for stored_at, quantized, scale, shape, results
+                in self._entries.values()
+                if now - stored_at < self.ttl_seconds
+            ]
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(entries))
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> int:
+        """Restore a snapshot written by save; returns entries loaded
+
+        A missing or unreadable snapshot is not an error — the cache
+        just starts cold, exactly as without persistence.
+        """
+        try:
+            with open(path, 'rb') as f:
+                entries = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return 0
+
+        now = time.monotonic()
+        loaded = 0
+        with self._lock:
+            for entry in entries[-self.maxsize:]:
+                expires_in = entry['expires_in']
+                if expires_in <= 0:
+                    continue
+                self._entries[self._next_key] = (
+                    now - (self.ttl_seconds - expires_in),
+                    array('b', entry['embedding']),
+                    entry['scale'],
+                    tuple(entry['shape']),
+                    entry['results'],
+                )
+                self._next_key += 1
+                loaded += 1
+        return loaded
+
+class EmbeddingCache:
+    """Exact-match LRU of normalized query text -> embedding vector
+
+    Identical query strings recur constantly (retries, repeated UI
+    questions), and each one otherwise pays an OpenAI embeddings
+    round-trip. Embeddings depend only on the text and the (fixed,
+    process-wide) model settings, never on collection contents, so this
+    cache is always on and needs no write-path invalidation; the TTL
+    just bounds how long a rarely-seen entry lingers.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl_seconds: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return ' '.join(text.lower().split())
+
+    def get(self, text: str) -> Optional[List[float]]:
+        key = self._key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, embedding = entry
+            if time.monotonic() - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Materialize plain floats only at the boundary; resident
+            # entries stay float32
+            return list(embedding)
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        with self._lock:
+            self._entries[self._key(text)] = (time.monotonic(),
+                                              array('f', embedding))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class _QueryBatcher:
+    """Micro-batches concurrent embedded queries into one Chroma call
+
+    HNSW traversal amortizes well across query vectors, so while chat
+    sessions overlap, queries that arrive within a short window (or
+    until max_batch accumulate) are dispatched as a single
+    collection.query with several embeddings and the per-query result
+    rows are fanned back out to their futures. Runs entirely on the
+    event loop, so no locking is needed; the Chroma call itself runs in
+    a worker thread.
+    """
+
+    def __init__(self, store: 'ChromaVectorStore', window_ms: float = 5.0,
+                 max_batch: int = 16):
+        self.store = store
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch = max_batch
+        # (embedding, shape, future) tuples awaiting the next flush
+        self._pending: List[tuple] = []
+        self._timer = None
+
+    async def submit(self, query_embedding: List[float],
+                     n_results: int, include_metadata: bool) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query_embedding, (n_results, include_metadata), future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+
+        # One Chroma call per distinct (n_results, include_metadata)
+        # shape in the batch
+        groups: Dict[tuple, List[tuple]] = {}
+        for embedding, shape, future in batch:
+            groups.setdefault(shape, []).append((embedding, future))
+        for shape, entries in groups.items():
+            asyncio.ensure_future(self._run_group(shape, entries))
+
+    async def _run_group(self, shape, entries) -> None:
+        n_results, include_metadata = shape
+        include_fields = ["documents", "distances"]
+        if include_metadata:
+            include_fields.append("metadatas")
+
+        try:
+            results = await asyncio.to_thread(
+                self.store.collection.query,
+                query_embeddings=[embedding for embedding, _ in entries],
+                n_results=n_results,
+                include=include_fields
+            )
+        except Exception as e:
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        with_metadata = include_metadata and 'metadatas' in results
+        for row, (_, future) in enumerate(entries):
+            if with_metadata:
+                formatted = [
+                    {'text': doc, 'distance': distance, 'metadata': meta}
+                    for doc, distance, meta
+                    in zip(results['documents'][row], results['distances'][row],
+                           results['metadatas'][row])
+                ]
+            else:
+                formatted = [
+                    {'text': doc, 'distance': distance}
+                    for doc, distance
+                    in zip(results['documents'][row], results['distances'][row])
+                ]
+            if not future.done():
+                future.set_result(formatted)
+
+# Process-wide: every store instance queries with the same model and
+# dimensions, so their embeddings are interchangeable
+_embedding_cache = EmbeddingCache()
+
 class ChromaVectorStore:
-    def __init__(self, collection_name: str = "coredna_docs", persist_directory: str = None):
+    def __init__(self, collection_name: str = "coredna_docs", persist_directory: str = None,
+                 num_shards: int = None):
         self.collection_name = collection_name
         self.persist_directory = persist_directory or settings.chroma_db_path
-        
-        # Ensure directory exists
-        os.makedirs(self.persist_directory, exist_ok=True)
-        
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
+
+        # Chroma serializes writes per collection through one HNSW
+        # index; CHROMA_SHARDS>1 splits documents across K collections
+        # (routed by id hash) so bulk inserts can run in parallel
+        self.num_shards = num_shards if num_shards is not None else int(os.getenv("CHROMA_SHARDS", "1"))
+
+        # CHROMA_MODE=http talks to a standalone Chroma server (e.g.
+        # docker run chromadb/chroma) so bulk writes don't block this
+        # process; the default stays the embedded on-disk client
+        if os.getenv("CHROMA_MODE", "").lower() == "http":
+            self.client = chromadb.HttpClient(
+                host=os.getenv("CHROMA_HOST", "localhost"),
+                port=int(os.getenv("CHROMA_PORT", "8000")),
+                settings=Settings(anonymized_telemetry=False)
+            )
+            logger.info("Using Chroma HTTP client")
+        else:
+            # Ensure directory exists
+            os.makedirs(self.persist_directory, exist_ok=True)
+
+            # Initialize ChromaDB client
+            self.client = chromadb.PersistentClient(
+                path=self.persist_directory,
+                settings=Settings(
+                    anonymized_telemetry=False,
+                    allow_reset=True
+                )
             )
-        )
         
-        # Get or create collection
+        # Get or create the collection (or one per shard)
+        self.collections = [
+            self._get_or_create_collection(name) for name in self._shard_names()
+        ]
+        self.collection = self.collections[0]
+        self._semantic_cache: Optional[SemanticQueryCache] = None
+        self._semantic_cache_snapshot_path: Optional[str] = None
+        self._query_batcher: Optional[_QueryBatcher] = None
+        self._count_cache: Optional[tuple] = None
+
+    def enable_query_batching(self, window_ms: float = 5.0,
+                              max_batch: int = 16) -> None:
+        """Micro-batch concurrent aquery calls into shared Chroma calls
+
+        Only effective in single-shard mode; sharded stores already fan
+        each query out per shard.
+        """
+        self._query_batcher = _QueryBatcher(self, window_ms=window_ms,
+                                            max_batch=max_batch)
+
+    def enable_semantic_cache(self, maxsize: int = 128,
+                              similarity_threshold: float = 0.95,
+                              ttl_seconds: float = 300.0,
+                              snapshot_path: Optional[str] = None) -> None:
+        """Serve near-duplicate embedded queries from an in-process cache
+
+        With snapshot_path, a snapshot left by a previous process is
+        loaded immediately (entries within their TTL only) so a restart
+        does not begin fully cold; call snapshot_semantic_cache from a
+        shutdown hook to write one.
+        """
+        self._semantic_cache = SemanticQueryCache(
+            maxsize=maxsize, similarity_threshold=similarity_threshold,
+            ttl_seconds=ttl_seconds
+        )
+        self._semantic_cache_snapshot_path = snapshot_path
+        if snapshot_path is not None:
+            loaded = self._semantic_cache.load(snapshot_path)
+            if loaded:
+                logger.info(f"Restored {loaded} semantic cache entries from {snapshot_path}")
+
+    def snapshot_semantic_cache(self) -> None:
+        """Persist the semantic cache for the next process to load"""
+        if self._semantic_cache is not None \
+                and self._semantic_cache_snapshot_path is not None:
+            self._semantic_cache.save(self._semantic_cache_snapshot_path)
+
+    def _invalidate_semantic_cache(self) -> None:
+        """Drop cached results; the collection contents have changed"""
+        if self._semantic_cache is not None:
+            self._semantic_cache.clear()
+            # A snapshot from before the write would resurrect stale
+            # results on the next restart
+            if self._semantic_cache_snapshot_path is not None:
+                try:
+                    os.remove(self._semantic_cache_snapshot_path)
+                except OSError:
+                    pass
+
+    def _shard_names(self) -> List[str]:
+        if self.num_shards == 1:
+            return [self.collection_name]
+        return [f"{self.collection_name}_shard_{i}" for i in range(self.num_shards)]
+
+    def _get_or_create_collection(self, name: str):
         try:
-            self.collection = self.client.get_collection(name=self.collection_name)
-            logger.info(f"Loaded existing collection: {self.collection_name}")
+            collection = self.client.get_collection(name=name)
+            logger.info(f"Loaded existing collection: {name}")
+            return collection
         except Exception:
             # Collection doesn't exist, create it
             try:
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
+                collection = self.client.create_collection(
+                    name=name,
                     metadata={"description": "Core DNA website content for RAG"}
                 )
-                logger.info(f"Created new collection: {self.collection_name}")
+                logger.info(f"Created new collection: {name}")
+                return collection
             except Exception as e:
                 logger.error(f"Failed to create collection: {e}")
                 raise
 
-    def add_documents(self, chunks: List[Dict[str, Any]]) -> bool:
-        """Add document chunks to the vector store"""
+    def _shard_for_id(self, doc_id: str) -> int:
+        if self.num_shards == 1:
+            return 0
+        return int(hashlib.blake2b(doc_id.encode(), digest_size=4).hexdigest(), 16) % self.num_shards
+
+    def _prepare_records(self, chunks: List[Dict[str, Any]]):
+        """Build parallel document/metadata/id lists for collection.add"""
+        documents = []
+        metadatas = []
+        ids = []
+
+        for chunk in chunks:
+            documents.append(chunk['text'])
+            metadatas.append(_display_metadata(chunk['text'], chunk['metadata']))
+            ids.append(_chunk_doc_id(chunk))
+
+        return documents, metadatas, ids
+
+    @staticmethod
+    def _embed_documents(documents: List[str]) -> List[List[float]]:
+        """Batch-embed document texts with the OpenAI API, 128 per call
+
+        Scraped corpora repeat themselves (boilerplate headers, footers,
+        navigation chunks), so each distinct text is embedded once and
+        the vector fanned back out to every position that carries it.
+        """
+        first_index: Dict[bytes, int] = {}
+        unique_texts: List[str] = []
+        positions: List[int] = []
+        for text in documents:
+            signature = hashlib.blake2b(text.encode('utf-8'),
+                                        digest_size=16).digest()
+            index = first_index.get(signature)
+            if index is None:
+                index = len(unique_texts)
+                first_index[signature] = index
+                unique_texts.append(text)
+            positions.append(index)
+
+        unique_embeddings: List[List[float]] = []
+        client = get_openai()
+        for start in range(0, len(unique_texts), 128):
+            response = client.embeddings.create(
+                model=settings.embedding_model,
+                input=unique_texts[start:start + 128],
+                dimensions=settings.embedding_dimensions
+            )
+            unique_embeddings.extend(item.embedding for item in response.data)
+
+        if len(unique_texts) < len(documents):
+            logger.info(f"Embedded {len(unique_texts)} unique texts "
+                        f"for {len(documents)} chunks")
+        return [unique_embeddings[index] for index in positions]
+
+    def add_documents(self, chunks: List[Dict[str, Any]],
+                      embeddings: Optional[List[List[float]]] = None,
+                      chroma_batch_size: int = 250) -> bool:
+        """Add document chunks to the vector store
+
+        If embeddings is provided (one vector per chunk, e.g. from a batched
+        embedding API call), Chroma stores them directly instead of running
+        its own embedding function per document.
+
+        Each collection.add call is one SQLite transaction, so documents
+        are flushed in slices of chroma_batch_size (Chroma's guidance is
+        100-250) rather than individually.
+        """
         try:
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for i, chunk in enumerate(chunks):
-                # Create unique ID for each chunk
-                url = chunk['metadata']['source_url']
-                chunk_id = chunk['metadata'].get('chunk_id', 0)
-                doc_id = f"{hash(url)}_{chunk_id}"
-                
-                documents.append(chunk['text'])
-                metadatas.append(chunk['metadata'])
-                ids.append(doc_id)
-            
-            # Add to collection in batches to avoid memory issues
-            batch_size = 100
-            total_added = 0
-            
-            for i in range(0, len(documents), batch_size):
-                end_idx = min(i + batch_size, len(documents))
-                batch_docs = documents[i:end_idx]
-                batch_metadata = metadatas[i:end_idx]
-                batch_ids = ids[i:end_idx]
-                
-                self.collection.add(
-                    documents=batch_docs,
-                    metadatas=batch_metadata,
-                    ids=batch_ids
-                )
-                
-                total_added += len(batch_docs)
-                logger.info(f"Added batch {i//batch_size + 1}: {total_added}/{len(documents)} documents")
-            
+            documents, metadatas, ids = self._prepare_records(chunks)
+
+            # Never let Chroma's default embedder re-embed documents
+            # one at a time (and with a different model) when a key is
+            # configured; batch through the same API the query path uses
+            if embeddings is None and settings.openai_api_key:
+                embeddings = self._embed_documents(documents)
+
+            # Route each record to its shard (everything lands in shard
+            # 0 when sharding is off)
+            shard_indices: List[List[int]] = [[] for _ in self.collections]
+            for index, doc_id in enumerate(ids):
+                shard_indices[self._shard_for_id(doc_id)].append(index)
+
+            def add_to_shard(shard: int) -> int:
+                collection = self.collections[shard]
+                indices = shard_indices[shard]
+
+                # Add in batches to avoid memory issues; each batch is
+                # one SQLite transaction
+                for i in range(0, len(indices), chroma_batch_size):
+                    selected = indices[i:i + chroma_batch_size]
+                    kwargs = {
+                        'documents': [documents[j] for j in selected],
+                        'metadatas': [metadatas[j] for j in selected],
+                        'ids': [ids[j] for j in selected],
+                    }
+                    if embeddings is not None:
+                        kwargs['embeddings'] = [embeddings[j] for j in selected]
+
+                    # Ids are deterministic, so re-indexing the same
+                    # chunk overwrites its row instead of erroring or
+                    # duplicating
+                    collection.upsert(**kwargs)
+                    logger.info(f"Shard {shard}: added {min(i + chroma_batch_size, len(indices))}/{len(indices)} documents")
+
+                return len(indices)
+
+            if self.num_shards == 1:
+                total_added = add_to_shard(0)
+            else:
+                # Per-collection writes serialize on the HNSW index, so
+                # shards are filled from parallel threads
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_shards) as pool:
+                    total_added = sum(pool.map(add_to_shard, range(self.num_shards)))
+
+            self._invalidate_semantic_cache()
             logger.info(f"Successfully added {total_added} documents to vector store")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error adding documents to vector store: {e}")
             return False
 
-    def query(self, query_text: str, n_results: int = 5, 
-              include_metadata: bool = True) -> List[Dict[str, Any]]:
-        """Query the vector store for relevant documents"""
+    async def aadd_documents(self, chunks: List[Dict[str, Any]],
+                             embeddings: Optional[List[List[float]]] = None,
+                             chroma_batch_size: int = 250,
+                             max_concurrency: int = 4) -> bool:
+        """Add document chunks with concurrent batch inserts
+
+        Useful with the HTTP client, where each batch insert is a
+        network round-trip: batches run in worker threads bounded by a
+        semaphore so they overlap instead of queueing behind each other.
+        """
         try:
+            documents, metadatas, ids = self._prepare_records(chunks)
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def add_batch(start: int):
+                end_idx = min(start + chroma_batch_size, len(documents))
+                kwargs = {
+                    'documents': documents[start:end_idx],
+                    'metadatas': metadatas[start:end_idx],
+                    'ids': ids[start:end_idx],
+                }
+                if embeddings is not None:
+                    kwargs['embeddings'] = embeddings[start:end_idx]
+
+                async with semaphore:
+                    await asyncio.to_thread(self.collection.upsert, **kwargs)
+                logger.info(f"Added batch at offset {start}: {end_idx}/{len(documents)} documents")
+
+            await asyncio.gather(*[
+                add_batch(start) for start in range(0, len(documents), chroma_batch_size)
+            ])
+
+            self._invalidate_semantic_cache()
+            logger.info(f"Successfully added {len(documents)} documents to vector store")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error adding documents to vector store: {e}")
+            return False
+
+    def query(self, query_text: str, n_results: int = 5,
+              include_metadata: bool = True,
+              query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+        """Query the vector store for relevant documents
+
+        If query_embedding is provided (e.g. from a cache), it is passed
+        directly to Chroma so the embedding step is skipped.
+        """
+        try:
+            # Text queries must be embedded with the same model the
+            # write path uses; letting Chroma embed internally (its
+            # default EF) would search in a different embedding space
+            # and fail on dimensions. Only keyless setups, which also
+            # indexed through the default EF, pass query_texts below.
+            if query_embedding is None and settings.openai_api_key:
+                query_embedding = _embedding_cache.get(query_text)
+                if query_embedding is None:
+                    response = get_openai().embeddings.create(
+                        model=settings.embedding_model,
+                        input=query_text,
+                        dimensions=settings.embedding_dimensions
+                    )
+                    query_embedding = response.data[0].embedding
+                    _embedding_cache.put(query_text, query_embedding)
+
+            cache_shape = (n_results, include_metadata)
+            if self._semantic_cache is not None and query_embedding is not None:
+                cached = self._semantic_cache.get(query_embedding, cache_shape)
+                if cached is not None:
+                    return cached
+
             include_fields = ["documents", "distances"]
             if include_metadata:
                 include_fields.append("metadatas")
-            
-            results = self.collection.query(
-                query_texts=[query_text],
-                n_results=n_results,
-                include=include_fields
-            )
-            
-            # Format results
-            formatted_results = []
-            for i in range(len(results['documents'][0])):
-                result = {
-                    'text': results['documents'][0][i],
-                    'distance': results['distances'][0][i],
-                }
-                
+
+            def query_collection(collection):
+                if query_embedding is not None:
+                    results = collection.query(
+                        query_embeddings=[query_embedding],
+                        n_results=n_results,
+                        include=include_fields
+                    )
+                else:
+                    results = collection.query(
+                        query_texts=[query_text],
+                        n_results=n_results,
+                        include=include_fields
+                    )
+
+                # Format results; zip over the row lists instead of
+                # re-indexing results[...][0][i] on every iteration
+                docs = results['documents'][0]
+                distances = results['distances'][0]
                 if include_metadata and 'metadatas' in results:
-                    result['metadata'] = results['metadatas'][0][i]
-                
-                formatted_results.append(result)
-            
+                    return [
+                        {'text': doc, 'distance': distance, 'metadata': meta}
+                        for doc, distance, meta
+                        in zip(docs, distances, results['metadatas'][0])
+                    ]
+                return [
+                    {'text': doc, 'distance': distance}
+                    for doc, distance in zip(docs, distances)
+                ]
+
+            if self.num_shards == 1:
+                formatted_results = query_collection(self.collection)
+            else:
+                # Fan the query out to every shard and keep the global
+                # top n by distance
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_shards) as pool:
+                    per_shard = pool.map(query_collection, self.collections)
+                formatted_results = sorted(
+                    (result for results in per_shard for result in results),
+                    key=lambda result: result['distance']
+                )[:n_results]
+
+            if self._semantic_cache is not None and query_embedding is not None \
+                    and formatted_results:
+                self._semantic_cache.put(query_embedding, cache_shape,
+                                         formatted_results)
+
             logger.info(f"Query returned {len(formatted_results)} results")
             return formatted_results
-            
+
         except Exception as e:
             logger.error(f"Error querying vector store: {e}")
             return []
 
+    async def aquery(self, query_text: str, n_results: int = 5,
+                     include_metadata: bool = True) -> List[Dict[str, Any]]:
+        """Async variant of query for running several queries concurrently
+
+        Embeds the query text via AsyncOpenAI, then runs the Chroma
+        lookup in a worker thread so concurrent queries overlap both the
+        network round-trip and the local search.
+        """
+        query_embedding = _embedding_cache.get(query_text)
+        if query_embedding is None:
+            try:
+                client = get_async_openai()
+                response = await client.embeddings.create(
+                    model=settings.embedding_model,
+                    input=query_text,
+                    dimensions=settings.embedding_dimensions
+                )
+                query_embedding = response.data[0].embedding
+            except Exception as e:
+                logger.error(f"Error embedding query text: {e}")
+                return []
+            _embedding_cache.put(query_text, query_embedding)
+
+        # Semantic-cache hits return immediately rather than waiting
+        # out a batching window
+        cache_shape = (n_results, include_metadata)
+        if self._semantic_cache is not None:
+            cached = self._semantic_cache.get(query_embedding, cache_shape)
+            if cached is not None:
+                return cached
+
+        if self._query_batcher is not None and self.num_shards == 1:
+            try:
+                results = await self._query_batcher.submit(
+                    query_embedding, n_results, include_metadata
+                )
+            except Exception as e:
+                logger.error(f"Error querying vector store: {e}")
+                return []
+            if self._semantic_cache is not None and results:
+                self._semantic_cache.put(query_embedding, cache_shape, results)
+            logger.info(f"Query returned {len(results)} results")
+            return results
+
+        return await asyncio.to_thread(
+            self.query, query_text, n_results=n_results,
+            include_metadata=include_metadata, query_embedding=query_embedding
+        )
+
+    def get_existing_hashes(self) -> Dict[str, Any]:
+        """Map of doc id -> stored content hash across all shards"""
+        existing: Dict[str, Any] = {}
+        for collection in self.collections:
+            results = collection.get(include=["metadatas"])
+            for doc_id, metadata in zip(results['ids'], results['metadatas']):
+                existing[doc_id] = (metadata or {}).get('content_hash')
+        return existing
+
+    def delete_ids(self, doc_ids: List[str]) -> None:
+        """Delete documents by id, routing each to its shard"""
+        per_shard: List[List[str]] = [[] for _ in self.collections]
+        for doc_id in doc_ids:
+            per_shard[self._shard_for_id(doc_id)].append(doc_id)
+        for collection, ids in zip(self.collections, per_shard):
+            if ids:
+                collection.delete(ids=ids)
+        self._invalidate_semantic_cache()
+
+    # Both fields are informational: the timestamp string is shared
+    # process-wide and reformatted at most once a second, and the
+    # per-shard SQLite count is reused for a few seconds between polls
+    _ts_cache = (0.0, "")
+    _COUNT_TTL_SECONDS = 5.0
+
     def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the collection"""
         try:
-            count = self.collection.count()
+            now = time.monotonic()
+
+            if self._count_cache is not None \
+                    and now - self._count_cache[0] >= self._COUNT_TTL_SECONDS:
+                self._count_cache = None
+            if self._count_cache is None:
+                self._count_cache = (
+                    now, sum(collection.count() for collection in self.collections)
+                )
+
+            if now - ChromaVectorStore._ts_cache[0] > 1.0:
+                ChromaVectorStore._ts_cache = (now, datetime.now().isoformat())
+
             return {
                 'name': self.collection_name,
-                'document_count': count,
+                'document_count': self._count_cache[1],
                 'persist_directory': self.persist_directory,
-                'created_at': datetime.now().isoformat()
+                'created_at': ChromaVectorStore._ts_cache[1]
             }
         except Exception as e:
             logger.error(f"Error getting collection info: {e}")
             return {}
 
     def delete_collection(self) -> bool:
-        """Delete the entire collection"""
+        """Delete the entire collection (every shard)"""
         try:
-            self.client.delete_collection(name=self.collection_name)
-            logger.info(f"Deleted collection: {self.collection_name}")
+            for name in self._shard_names():
+                self.client.delete_collection(name=name)
+                logger.info(f"Deleted collection: {name}")
+            self._invalidate_semantic_cache()
             return True
         except Exception as e:
             logger.error(f"Error deleting collection: {e}")
@@ -152,56 +817,364 @@ class ChromaVectorStore:
     def reset_collection(self) -> bool:
         """Reset the collection by deleting and recreating it"""
         try:
-            # Delete existing collection
-            try:
-                self.client.delete_collection(name=self.collection_name)
-            except ValueError:
-                pass  # Collection doesn't exist
-            
-            # Create new collection
-            self.collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Core DNA website content for RAG"}
-            )
-            
-            logger.info(f"Reset collection: {self.collection_name}")
+            self.collections = []
+            for name in self._shard_names():
+                # Delete existing collection
+                try:
+                    self.client.delete_collection(name=name)
+                except ValueError:
+                    pass  # Collection doesn't exist
+
+                # Create new collection
+                self.collections.append(self.client.create_collection(
+                    name=name,
+                    metadata={"description": "Core DNA website content for RAG"}
+                ))
+                logger.info(f"Reset collection: {name}")
+
+            self.collection = self.collections[0]
+            self._invalidate_semantic_cache()
             return True
-            
+
         except Exception as e:
             logger.error(f"Error resetting collection: {e}")
             return False
 
+def _iter_chunk_slices(chunks_file: str, slice_size: int):
+    """Yield slices of chunks stream-parsed from the JSON array
+
+    ijson parses one element at a time, so only the current slice is
+    resident instead of the whole corpus that json.load would
+    materialize before the first embedding could start.
+    """
+    import ijson
+
+    batch: List[Dict[str, Any]] = []
+    with open(chunks_file, 'rb') as f:
+        for chunk in ijson.items(f, 'item'):
+            batch.append(chunk)
+            if len(batch) == slice_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
 def index_coredna_documents(chunks_file: str = None) -> bool:
     """Index Core DNA documents from processed chunks file"""
     if not chunks_file:
         chunks_file = os.path.join("data", "processed", "coredna_chunks.json")
-    
+
     if not os.path.exists(chunks_file):
         logger.error(f"Chunks file not found: {chunks_file}")
         return False
-    
+
     try:
-        # Load chunks
-        with open(chunks_file, 'r', encoding='utf-8') as f:
-            chunks = json.load(f)
-        
-        logger.info(f"Loaded {len(chunks)} chunks from {chunks_file}")
-        
         # Initialize vector store
         vector_store = ChromaVectorStore()
-        
+
         # Reset collection to start fresh
         vector_store.reset_collection()
-        
-        # Add documents
-        success = vector_store.add_documents(chunks)
-        
+
+        # Chunks stream straight off the parser into the pipeline.
+        # With a key configured they are embedded with batched API
+        # calls (one request per 128 chunks instead of Chroma embedding
+        # each add batch internally), and embedding overlaps insertion:
+        # worker threads fetch upcoming slices' embeddings while the
+        # main thread commits the current slice to SQLite. The bounded
+        # deque caps how many parsed slices wait in memory.
+        slice_size = 128
+        total = 0
+
+        if settings.openai_api_key:
+            def embed_slice(chunk_slice: List[Dict[str, Any]]) -> List[List[float]]:
+                return vector_store._embed_documents(
+                    [chunk['text'] for chunk in chunk_slice]
+                )
+
+            def commit_slice(chunk_slice: List[Dict[str, Any]], future) -> bool:
+                nonlocal total
+                added = vector_store.add_documents(chunk_slice,
+                                                   embeddings=future.result())
+                total += len(chunk_slice)
+                logger.info(f"Indexed {total} chunks")
+                return added
+
+            # EMBED_CONCURRENCY is the same knob the async indexer
+            # honors; it bounds both the worker threads and how many
+            # embedded slices may wait for the (serial) SQLite writer
+            workers = max(1, min(8, int(os.getenv("EMBED_CONCURRENCY", "4"))))
+
+            success = True
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk_slice in _iter_chunk_slices(chunks_file, slice_size):
+                    pending.append((chunk_slice, pool.submit(embed_slice, chunk_slice)))
+                    while len(pending) > workers:
+                        success = commit_slice(*pending.popleft()) and success
+                while pending:
+                    success = commit_slice(*pending.popleft()) and success
+        else:
+            success = True
+            for chunk_slice in _iter_chunk_slices(chunks_file, slice_size):
+                success = vector_store.add_documents(chunk_slice) and success
+                total += len(chunk_slice)
+
         if success:
             info = vector_store.get_collection_info()
-            logger.info(f"Indexing completed. Collection info: {info}")
-        
+            logger.info(f"Indexing completed ({total} chunks). Collection info: {info}")
+
         return success
-        
+
+    except Exception as e:
+        logger.error(f"Error indexing documents: {e}")
+        return False
+
+@functools.lru_cache(maxsize=1)
+def get_store() -> 'ChromaVectorStore':
+    """Process-wide ChromaVectorStore singleton
+
+    Constructing the store reopens the SQLite file and memory-maps the
+    HNSW index, so callers in the same process should share one
+    instance instead of rebuilding it per operation.
+    """
+    return ChromaVectorStore()
+
+@functools.lru_cache(maxsize=1)
+def get_openai():
+    """Shared sync OpenAI client so connections are pooled across calls"""
+    import openai
+    return openai.OpenAI(api_key=settings.openai_api_key)
+
+@functools.lru_cache(maxsize=1)
+def get_async_openai():
+    """Shared AsyncOpenAI client so connections are pooled across calls"""
+    import openai
+    return openai.AsyncOpenAI(api_key=settings.openai_api_key)
+
+def _display_metadata(text: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata extended with display fields derived from the chunk
+
+    summary_200 and source_type depend only on the stored document, so
+    they are computed once at indexing time; the API routes read them
+    from metadata instead of re-slicing text and re-scanning URLs on
+    every request.
+    """
+    derived = dict(metadata)
+    derived['summary_200'] = text[:200] + "..." if len(text) > 200 else text
+    derived['source_type'] = (
+        'blog' if '/blogs/' in metadata.get('source_url', '') else 'feature'
+    )
+    return derived
+
+@functools.lru_cache(maxsize=4096)
+def _url_hash(url: str) -> str:
+    """Stable short digest of a source URL
+
+    Python's hash() is randomized per process (PYTHONHASHSEED), so ids
+    built from it change across runs and re-indexing inserts every
+    chunk again under a new id. BLAKE2b is deterministic; the memo
+    avoids rehashing the same URL for each of its chunks.
+    """
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+
+def _chunk_doc_id(chunk: Dict[str, Any]) -> str:
+    """Unique ID for a chunk, derived from its source URL and position"""
+    url = chunk['metadata']['source_url']
+    chunk_id = chunk['metadata'].get('chunk_id', 0)
+    return f"{_url_hash(url)}_{chunk_id}"
+
+def _preprocess_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a chunk's text and record its content hash
+
+    The hash is stored in metadata so later runs can tell whether a
+    chunk changed since it was last indexed.
+    """
+    chunk['text'] = ' '.join(chunk['text'].split())
+    chunk['metadata']['content_hash'] = hashlib.sha256(chunk['text'].encode('utf-8')).hexdigest()
+    return chunk
+
+async def aindex_coredna_documents(chunks_file: str = None,
+                                   batch_size: int = 256,
+                                   max_concurrency: int = None,
+                                   store: 'ChromaVectorStore' = None) -> bool:
+    """Index Core DNA documents with concurrent embedding requests
+
+    Chunks are stream-parsed from the JSON file with ijson instead of
+    json.load, so only a few batches are resident at a time
+    (O(batch_size * max_concurrency) memory instead of the whole
+    corpus). Each wave's embeddings.create calls run concurrently via
+    asyncio.gather; wave size doubles as the concurrency bound to stay
+    under OpenAI rate limits.
+
+    Parsing and text normalization run in a producer thread (with a
+    thread pool for the per-chunk prep) feeding a bounded queue, so prep
+    overlaps the OpenAI request latency instead of alternating with it.
+    """
+    import ijson
+    import openai
+
+    if not chunks_file:
+        chunks_file = os.path.join("data", "processed", "coredna_chunks.json")
+
+    if not os.path.exists(chunks_file):
+        logger.error(f"Chunks file not found: {chunks_file}")
+        return False
+
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("EMBED_CONCURRENCY", "8"))
+
+    try:
+        client = get_async_openai()
+
+        vector_store = store or get_store()
+        total_indexed = 0
+        total_skipped = 0
+
+        # Map of existing doc id -> content hash; chunks whose hash is
+        # unchanged are skipped entirely, so a re-run only pays for the
+        # delta instead of re-embedding the whole corpus
+        existing_hashes: Dict[str, Any] = {}
+        try:
+            existing_hashes = vector_store.get_existing_hashes()
+        except Exception as e:
+            logger.warning(f"Could not read existing collection state: {e}")
+
+        if existing_hashes:
+            logger.info(f"Found {len(existing_hashes)} previously indexed chunks")
+
+        async def embed_batch(texts: List[str], max_attempts: int = 6):
+            # Retry 429s/timeouts with jittered exponential backoff so
+            # concurrent batches don't all hammer the API in lockstep;
+            # a Retry-After header, when present, wins over the backoff
+            for attempt in range(max_attempts):
+                try:
+                    return await client.embeddings.create(
+                        model=settings.embedding_model,
+                        input=texts,
+                        dimensions=settings.embedding_dimensions
+                    )
+                except (openai.RateLimitError, openai.APITimeoutError) as e:
+                    if attempt == max_attempts - 1:
+                        raise
+
+                    retry_after = None
+                    response = getattr(e, 'response', None)
+                    if response is not None:
+                        retry_after = response.headers.get('retry-after')
+
+                    if retry_after:
+                        wait = float(retry_after)
+                    else:
+                        wait = max(1.0, random.uniform(0, min(30.0, 2.0 ** attempt)))
+
+                    logger.warning(f"Embedding request failed ({type(e).__name__}), retrying in {wait:.1f}s")
+                    await asyncio.sleep(wait)
+
+        async def index_wave(wave: List[List[Dict[str, Any]]]) -> bool:
+            nonlocal total_indexed
+            responses = await asyncio.gather(*[
+                embed_batch([chunk['text'] for chunk in batch]) for batch in wave
+            ])
+            for batch, response in zip(wave, responses):
+                # Changed chunks keep their id, so drop the stale rows
+                # before re-adding them
+                stale_ids = [
+                    doc_id for doc_id in (_chunk_doc_id(chunk) for chunk in batch)
+                    if doc_id in existing_hashes
+                ]
+                if stale_ids:
+                    vector_store.delete_ids(stale_ids)
+
+                embeddings = [item.embedding for item in response.data]
+                if not vector_store.add_documents(batch, embeddings=embeddings):
+                    return False
+                total_indexed += len(batch)
+            logger.info(f"Indexed {total_indexed} chunks so far")
+            return True
+
+        # Producer: parse and preprocess batches in a background thread,
+        # handing them over through a bounded queue so at most a few
+        # batches wait while the consumer embeds
+        batch_queue: queue.Queue = queue.Queue(maxsize=4)
+
+        # Threads are the default since the per-chunk prep is cheap;
+        # PREPROCESS_EXECUTOR=process switches to a process pool for
+        # corpora where normalization+hashing becomes CPU-bound, with a
+        # large map chunksize to amortize pickling
+        if os.getenv("PREPROCESS_EXECUTOR", "thread").lower() == "process":
+            pool_cls = concurrent.futures.ProcessPoolExecutor
+            pool_workers = max(1, (os.cpu_count() or 2) - 1)
+            map_chunksize = 128
+        else:
+            pool_cls = concurrent.futures.ThreadPoolExecutor
+            pool_workers = min(32, (os.cpu_count() or 1) + 4)
+            map_chunksize = 1
+
+        # A producer failure must fail the run; without this the
+        # traceback would go to threading.excepthook, the end-of-stream
+        # marker would still be enqueued, and a partially indexed corpus
+        # would be reported as success
+        producer_error: List[BaseException] = []
+
+        def produce_batches():
+            nonlocal total_skipped
+            try:
+                with open(chunks_file, 'rb') as f, \
+                        pool_cls(max_workers=pool_workers) as pool:
+                    pending: List[Dict[str, Any]] = []
+                    ready: List[Dict[str, Any]] = []
+
+                    def drain_pending():
+                        nonlocal pending, ready, total_skipped
+                        for chunk in pool.map(_preprocess_chunk, pending, chunksize=map_chunksize):
+                            if existing_hashes.get(_chunk_doc_id(chunk)) == chunk['metadata']['content_hash']:
+                                total_skipped += 1
+                                continue
+                            ready.append(chunk)
+                            if len(ready) >= batch_size:
+                                batch_queue.put(ready)
+                                ready = []
+                        pending = []
+
+                    for chunk in ijson.items(f, 'item'):
+                        pending.append(chunk)
+                        if len(pending) >= batch_size:
+                            drain_pending()
+                    drain_pending()
+                    if ready:
+                        batch_queue.put(ready)
+            except BaseException as e:
+                producer_error.append(e)
+            finally:
+                batch_queue.put(None)  # end-of-stream marker
+
+        producer = threading.Thread(target=produce_batches, daemon=True)
+        producer.start()
+
+        wave: List[List[Dict[str, Any]]] = []
+        while True:
+            batch = await asyncio.to_thread(batch_queue.get)
+            if batch is None:
+                break
+            wave.append(batch)
+            if len(wave) >= max_concurrency:
+                if not await index_wave(wave):
+                    return False
+                wave = []
+
+        producer.join()
+        if producer_error:
+            raise producer_error[0]
+        if wave and not await index_wave(wave):
+            return False
+
+        info = vector_store.get_collection_info()
+        logger.info(
+            f"Indexing completed: {total_indexed} chunks embedded, "
+            f"{total_skipped} unchanged chunks skipped. Collection info: {info}"
+        )
+        return True
+
     except Exception as e:
         logger.error(f"Error indexing documents: {e}")
         return False
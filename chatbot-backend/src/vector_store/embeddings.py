@@ -1,19 +1,70 @@
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.core import Settings
+import hashlib
 import openai
+import os
+import sqlite3
+import struct
 import logging
-from typing import List
+from typing import List, Optional
 
 try:
     from ..config.settings import settings
 except ImportError:
     import sys
-    import os
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+class EmbeddingCache:
+    """Persistent content-hash -> vector cache backed by SQLite
+
+    Repeat indexing runs (common while iterating on the scraper) mostly
+    re-embed unchanged chunks. Caching vectors under
+    sha256(text) keys lets those runs skip the OpenAI round-trip. Keys
+    are prefixed with the model name so switching embedding models
+    invalidates the cache instead of serving stale vectors.
+    """
+
+    def __init__(self, model: str, cache_path: str = None):
+        self.model = model
+        self.cache_path = cache_path or os.path.join("data", "processed", "embedding_cache.sqlite")
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.cache_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+        )
+        self.conn.commit()
+
+    def _key(self, text: str) -> str:
+        return f"{self.model}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the cached vector for text, or None on a miss"""
+        row = self.conn.execute(
+            "SELECT vector FROM embeddings WHERE key = ?", (self._key(text),)
+        ).fetchone()
+        if row is None:
+            return None
+        blob = row[0]
+        return list(struct.unpack(f"{len(blob) // 2}e", blob))
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]) -> None:
+        """Persist vectors as packed float16 blobs in one transaction
+
+        Half precision loses ~3 decimal digits, which is noise for
+        cosine similarity, and halves the cache file size.
+        """
+        rows = [
+            (self._key(text), struct.pack(f"{len(vector)}e", *vector))
+            for text, vector in zip(texts, vectors)
+        ]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+        )
+        self.conn.commit()
+
 class EmbeddingManager:
     def __init__(self, api_key: str = None, model: str = None):
         self.api_key = api_key or settings.openai_api_key
@@ -24,7 +75,8 @@ class EmbeddingManager:
         
         # Set up OpenAI client
         openai.api_key = self.api_key
-        
+        self.client = openai.OpenAI(api_key=self.api_key)
+
         # Initialize LlamaIndex embedding model
         self.embedding_model = OpenAIEmbedding(
             api_key=self.api_key,
@@ -33,7 +85,10 @@ class EmbeddingManager:
         
         # Configure LlamaIndex global settings
         Settings.embed_model = self.embedding_model
-        
+
+        # Disk cache so unchanged chunks skip the API on repeat runs
+        self.cache = EmbeddingCache(model=self.model)
+
         logger.info(f"Initialized embedding model: {self.model}")
 
     def get_text_embedding(self, text: str) -> List[float]:
@@ -45,13 +100,36 @@ class EmbeddingManager:
             logger.error(f"Error getting embedding for text: {e}")
             return []
 
-    def get_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings for a batch of texts"""
+    def get_batch_embeddings(self, texts: List[str], batch_size: int = 256) -> List[List[float]]:
+        """Get embeddings for a batch of texts
+
+        The embeddings endpoint accepts a list of inputs, so texts are
+        sent in slices of batch_size per request instead of one request
+        per text. The API returns items in input order, so the combined
+        list stays aligned with texts.
+        """
         try:
-            embeddings = []
-            for text in texts:
-                embedding = self.get_text_embedding(text)
-                embeddings.append(embedding)
+            embeddings: List[Optional[List[float]]] = [self.cache.get(text) for text in texts]
+            miss_indices = [i for i, vector in enumerate(embeddings) if vector is None]
+
+            if miss_indices:
+                miss_texts = [texts[i] for i in miss_indices]
+                fresh = []
+                for i in range(0, len(miss_texts), batch_size):
+                    response = self.client.embeddings.create(
+                        model=self.model,
+                        input=miss_texts[i:i + batch_size],
+                        dimensions=settings.embedding_dimensions
+                    )
+                    fresh.extend(item.embedding for item in response.data)
+
+                self.cache.put_many(miss_texts, fresh)
+                for index, vector in zip(miss_indices, fresh):
+                    embeddings[index] = vector
+
+            if len(miss_indices) < len(texts):
+                logger.info(f"Embedding cache served {len(texts) - len(miss_indices)}/{len(texts)} texts")
+
             return embeddings
         except Exception as e:
             logger.error(f"Error getting batch embeddings: {e}")
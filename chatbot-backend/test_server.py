@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from datetime import datetime
 from typing import List, Optional
+import re
 import uvicorn
 
 # Simple data models
@@ -51,6 +52,11 @@ MOCK_RESPONSES = {
     "platform": "Core DNA is a comprehensive digital experience platform that combines ecommerce, content management, and automation capabilities in a single solution."
 }
 
+# One alternation pattern scans the message in a single pass instead of
+# one substring search per keyword
+_KEYWORD_RE = re.compile('|'.join(map(re.escape, MOCK_RESPONSES)))
+_DEMO_KEYWORDS = tuple(MOCK_RESPONSES)
+
 @app.get("/")
 async def root():
     """Welcome endpoint"""
@@ -81,10 +87,12 @@ async def chat_endpoint(request: ChatRequest):
         sources = ["https://www.coredna.com"]
         confidence = 0.5
         
-        # Find relevant response
-        for keyword, response in MOCK_RESPONSES.items():
-            if keyword in message_lower:
-                response_text = response
+        # Find relevant response; definition order still decides when
+        # several keywords appear in one message
+        found = {match.group(0) for match in _KEYWORD_RE.finditer(message_lower)}
+        for keyword in MOCK_RESPONSES:
+            if keyword in found:
+                response_text = MOCK_RESPONSES[keyword]
                 sources = [f"https://www.coredna.com/{keyword}"]
                 confidence = 0.8
                 break
@@ -112,7 +120,7 @@ async def search_demo(q: str):
     return {
         "query": q,
         "message": "Search functionality will be available once the full vector database is set up",
-        "demo_keywords": list(MOCK_RESPONSES.keys())
+        "demo_keywords": _DEMO_KEYWORDS
     }
 
 if __name__ == "__main__":
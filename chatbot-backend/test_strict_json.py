@@ -3,7 +3,7 @@
 Test the strict JSON output format for Core DNA assistant
 """
 
-import json
+import orjson
 from production_server import assemble_grounded_response as prod_assembler
 from smart_demo_server import assemble_grounded_response as demo_assembler
 
@@ -75,22 +75,28 @@ def test_strict_json_format():
         
         # Test JSON serialization
         try:
-            prod_json = json.dumps(prod_response)
-            demo_json = json.dumps(demo_response)
+            prod_json = orjson.dumps(prod_response)
+            demo_json = orjson.dumps(demo_response)
             print("   ✅ JSON serialization successful")
         except Exception as e:
             print(f"   ❌ JSON serialization failed: {e}")
         
         print("-" * 30)
 
+# Response contract, fixed at import so validate_json_structure does no
+# per-call setup
+_REQUIRED_FIELDS = ('text', 'citations', 'confidence', 'actions')
+_CITATION_FIELDS = ('title', 'url', 'quote')
+_VALID_ACTION_TYPES = frozenset(
+    {'none', 'clarify', 'handoff', 'collect_lead', 'use_tool'}
+)
+
 def validate_json_structure(response, server_type):
     """Validate the JSON response structure"""
-    required_fields = ['text', 'citations', 'confidence', 'actions']
-    
     print(f"   {server_type} JSON Structure:")
     
     # Check required fields
-    for field in required_fields:
+    for field in _REQUIRED_FIELDS:
         if field in response:
             print(f"     ✅ {field}: {type(response[field])}")
         else:
@@ -106,8 +112,7 @@ def validate_json_structure(response, server_type):
         print(f"     📚 Citations count: {len(response['citations'])}")
         for i, citation in enumerate(response['citations']):
             if isinstance(citation, dict):
-                citation_fields = ['title', 'url', 'quote']
-                missing = [f for f in citation_fields if f not in citation]
+                missing = [f for f in _CITATION_FIELDS if f not in citation]
                 if missing:
                     print(f"       ❌ Citation {i} missing: {missing}")
                 else:
@@ -125,8 +130,7 @@ def validate_json_structure(response, server_type):
         for i, action in enumerate(response['actions']):
             if isinstance(action, dict) and 'type' in action:
                 action_type = action['type']
-                valid_types = ['none', 'clarify', 'handoff', 'collect_lead', 'use_tool']
-                if action_type in valid_types:
+                if action_type in _VALID_ACTION_TYPES:
                     print(f"       ✅ Action {i}: {action_type}")
                     if action_type == 'collect_lead' and 'fields' in action:
                         print(f"         📋 Lead fields: {action['fields']}")